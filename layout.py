@@ -1,12 +1,14 @@
 from src.geometry.Vector import Vector
 from src.geometry.Shape import arrow
+from src.geometry.Rectangle import bounding_rect
 
 
 def layout(objects, margin=25):
     x = margin
     for object in objects:
-        yield object.move(x - object.left, margin - object.bottom)
-        x += object.width
+        rect = bounding_rect(object)
+        yield object.move(x - rect.left, margin - rect.bottom)
+        x += rect.width
         x += margin
 
 
@@ -14,8 +16,9 @@ def topToBottom(*objects, margin=50):
     y = margin
     l = []
     for object in objects:
-        l.append(object.move(margin - object.left, y - object.top))
-        y -= object.height
+        rect = bounding_rect(object)
+        l.append(object.move(margin - rect.left, y - rect.top))
+        y -= rect.height
         y -= margin
 
     return l
@@ -25,8 +28,9 @@ def side_by_side(*objects, margin=25):
     x = margin
     l = []
     for object in objects:
-        l.append(object.move(x - object.left, margin - object.top))
-        x += object.width
+        rect = bounding_rect(object)
+        l.append(object.move(x - rect.left, margin - rect.top))
+        x += rect.width
         x += margin
 
     return l
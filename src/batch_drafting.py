@@ -0,0 +1,109 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from src.pattern_file import PatternFile, pattern_bytes, save_pattern
+from src.sizing.BodyMeasurements import BodyMeasurements
+
+# How many bodies can be waiting or being drafted per process, at most
+pending_per_process = 2
+
+
+def body_arguments(body: BodyMeasurements):
+    "Just what is needed to make the same body again in another process"
+    return body.size, dict(body.known)
+
+
+def draft_packed(block, size, known: dict, options: dict) -> bytes:
+    "Draft a block for a body, packed into the bytes of a pattern file"
+    return pattern_bytes(block(body=BodyMeasurements(size, **known), **options))
+
+
+def unpack(data: bytes):
+    "The pattern drafted in another process, with its pieces read when used"
+    return PatternFile(data=data).load()
+
+
+def draft_many(block, bodies, processes=None, **options):
+    """Draft block(body=body, **options) for every body, over a pool of processes.
+
+    Yields (index, body, pattern) for each body as soon as it is finished, so
+    not always in order. Only a few bodies per process are taken from bodies
+    at a time, so it can be a generator of any length.
+
+    The geometry comes back from each process as the arrays of a pattern
+    file. block has to be importable by name, which means defined at the top
+    level of a module.
+    """
+    bodies = enumerate(bodies)
+    if processes == 1:
+        for index, body in bodies:
+            yield index, body, unpack(
+                draft_packed(block, *body_arguments(body), options)
+            )
+        return
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = {}
+
+        def submit_next() -> bool:
+            for index, body in bodies:
+                future = pool.submit(
+                    draft_packed, block, *body_arguments(body), options
+                )
+                pending[future] = index, body
+                return True
+            return False
+
+        while len(pending) < processes * pending_per_process and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, body = pending.pop(future)
+                submit_next()
+                yield index, body, unpack(future.result())
+
+
+def draft_batch(block, bodies, sink, processes=None, **options) -> int:
+    "Draft block for every body like draft_many, calling sink(index, body, pattern)"
+    count = 0
+    for index, body, pattern in draft_many(
+        block, bodies, processes=processes, **options
+    ):
+        sink(index, body, pattern)
+        count += 1
+    return count
+
+
+def pattern_file_sink(directory: str, name="{index:05d} size {size:g}.pattern"):
+    "A sink which saves each pattern to its own pattern file in directory"
+    os.makedirs(directory, exist_ok=True)
+
+    def sink(index, body, pattern):
+        save_pattern(
+            os.path.join(directory, name.format(index=index, size=body.size)), pattern
+        )
+
+    return sink
+
+
+def svg_file_sink(
+    directory: str, name="{index:05d} size {size:g}.svg", **render_options
+):
+    "A sink which renders each pattern to its own svg file in directory"
+    from src.render import render_to
+
+    os.makedirs(directory, exist_ok=True)
+
+    def sink(index, body, pattern):
+        filename = os.path.join(directory, name.format(index=index, size=body.size))
+        render_to(filename, pattern, **render_options)
+
+    return sink
+
+
+def size_run(sizes=range(6, 28, 2)):
+    "Standard bodies for a run of sizes"
+    return (BodyMeasurements(size=size) for size in sizes)
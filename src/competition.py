@@ -1,3 +1,6 @@
+import heapq
+
+
 def competition(items, score_function):
     if len(items) == 0:
         raise Exception("Cannot have competition with no items")
@@ -13,6 +16,5 @@ def competition(items, score_function):
 
 
 def multiwinner_competition(items, score_function, number_of_winners=1):
-    copy = items.copy()
-    copy.sort(key=score_function)
-    return copy[:number_of_winners]
+    # Same as sorting by score and taking the first few, without sorting everything
+    return heapq.nsmallest(number_of_winners, items, key=score_function)
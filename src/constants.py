@@ -1 +1,4 @@
 global_tolerance = .0001
+
+# How far (in mm) a curve flattened into line segments may stray from the true curve
+default_flattening_tolerance = 0.1
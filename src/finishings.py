@@ -3,6 +3,6 @@ from src.geometry.Group import Group
 
 
 def rolled_hem(edge: Shape, amount: float):
-    allowance = edge.allowance(amount * 1.75)
-    fold_line = edge.parallel(amount).with_style("dashed")
-    return Group(allowance, fold_line)
+    hem_edge, fold_line = edge.parallels([amount * 1.75, amount])
+    allowance = edge.allowance(amount * 1.75, parallel=hem_edge)
+    return Group(allowance, fold_line.with_style("dashed"))
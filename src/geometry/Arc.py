@@ -1,34 +1,92 @@
 import math
 
 import numpy as np
-from Shape import Shape
-from Vector import Vector
 
-from render import render
+from src.constants import default_flattening_tolerance
+from src.geometry.Circle import Circle
+from src.geometry.Shape import Shape
+from src.geometry.Vector import Vector
+from src.svg_writer import format_numbers
 
 
-class Arc:
+class Arc(Circle):
+    "Part of a circle from startAngle to endAngle, anticlockwise if endAngle is larger"
+
     def __init__(
         self, center: Vector, radius: float, startAngle: float, endAngle: float
     ):
-        self.center = center
-        self.radius = radius
+        super().__init__(center, radius)
         self.startAngle = startAngle
         self.endAngle = endAngle
 
-    def pointAtAngle(self, angle):
-        return self.center + Vector(1, 0).withAngle(angle).withLength(self.radius)
+    @property
+    def angleSize(self) -> float:
+        "Signed angle swept from start to end, positive is anticlockwise"
+        return self.endAngle - self.startAngle
+
+    @property
+    def start(self) -> Vector:
+        return self.pointAtAngle(self.startAngle)
+
+    @property
+    def end(self) -> Vector:
+        return self.pointAtAngle(self.endAngle)
+
+    @property
+    def length(self):
+        return self.radius * abs(self.angleSize)
+
+    def angle_along(self, w):
+        "Angle of the point w along the arc from its start"
+        return self.startAngle + math.copysign(1.0, self.angleSize) * w / self.radius
+
+    def segments_for_tolerance(self, tolerance=default_flattening_tolerance) -> int:
+        return super().segments_for_tolerance(tolerance, self.angleSize)
+
+    def flatten(self, tolerance=default_flattening_tolerance) -> np.ndarray:
+        "Just enough points along the arc, both ends included, to stay within tolerance"
+        segments = self.segments_for_tolerance(tolerance)
+        return self.coordinates_at_angles(
+            np.linspace(self.startAngle, self.endAngle, segments + 1)
+        )
+
+    def shape(self, tolerance=default_flattening_tolerance) -> Shape:
+        return Shape(self.flatten(tolerance))
 
-    def polyline(self, resolution=100):
-        step = (self.endAngle - self.startAngle) / resolution
+    def svg_path_command(self, precision=None) -> str:
+        "The svg `A` commands which draw this arc on from its start point"
+        # One svg arc can't go more than half way round, so draw it in pieces that don't
+        pieces = max(1, math.ceil(abs(self.angleSize) / math.pi))
+        # Flipping the y axis for svg turns increasing angles into decreasing ones
+        sweep = 0 if self.angleSize > 0 else 1
+        commands = []
+        for piece in range(1, pieces + 1):
+            end = self.pointAtAngle(self.startAngle + self.angleSize * piece / pieces)
+            radius, x, y = format_numbers([self.radius, end.x, -end.y], precision)
+            commands.append("A{},{} 0 0,{} {},{}".format(radius, radius, sweep, x, y))
+        return " ".join(commands)
+
+    def translated(self, x: float, y: float) -> "Arc":
+        "The same arc, moved x to the right and y up"
+        return Arc(
+            self.center + Vector(x, y), self.radius, self.startAngle, self.endAngle
+        )
+
+    def polyline(self, resolution=None, tolerance=default_flattening_tolerance):
+        """Points along the arc, stopping a step short of the end.
+
+        Without a resolution, just enough points to stay within tolerance.
+        """
+        if resolution is None:
+            return self.shape(tolerance)
+        step = self.angleSize / resolution
         return Shape(
-            [
-                self.pointAtAngle(angle)
-                for angle in np.arange(self.startAngle, self.endAngle, step)
-            ]
+            self.coordinates_at_angles(np.arange(self.startAngle, self.endAngle, step))
         )
 
 
 if __name__ == "__main__":
+    from src.render import render
+
     myArc = Arc(center=Vector(0, 50), radius=20, startAngle=0, endAngle=math.pi)
     render(myArc.polyline()).saveSvg("Arc example.svg")
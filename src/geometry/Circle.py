@@ -2,6 +2,7 @@ import math
 
 import numpy as np
 
+from src.constants import default_flattening_tolerance
 from src.geometry.Shape import Shape
 from src.geometry.Vector import Vector
 
@@ -15,34 +16,93 @@ class Circle:
     def circumference(self):
         return 2 * math.pi * self.radius
 
+    @property
+    def length(self):
+        return self.circumference
+
     def pointAtAngle(self, angle):
-        return self.center + Vector(1, 0).withAngle(angle).withLength(self.radius)
+        return Vector(
+            self.center.x + self.radius * math.cos(angle),
+            self.center.y + self.radius * math.sin(angle),
+        )
+
+    def coordinates_at_angles(self, angles) -> np.ndarray:
+        "Points on the circle at every angle in an array, as an (N, 2) array"
+        angles = np.asarray(angles, dtype=np.float64)
+        return np.stack(
+            [
+                self.center.x + self.radius * np.cos(angles),
+                self.center.y + self.radius * np.sin(angles),
+            ],
+            axis=1,
+        )
+
+    def angle_along(self, w):
+        "Angle of the point w along the circle (an array of w gives an array of angles)"
+        return w / self.circumference * 2 * math.pi
 
     def pointAlong(self, w):
-        angle = w / self.circumference * 2 * math.pi
-        return self.pointAtAngle(angle)
+        return self.pointAtAngle(self.angle_along(w))
 
-    def iteratePoints(self, resolution, startAngle=0, endAngle=2 * math.pi):
-        for angle in np.arange(0, 2 * math.pi, 2 * math.pi / resolution):
-            yield self.pointAtAngle(angle)
+    def point_along(self, w):
+        return self.pointAlong(w)
 
-    def polyline(self, resolution):
-        shape = Shape(
-            [
-                self.pointAtAngle(angle)
-                for angle in np.arange(0, 2 * math.pi, 2 * math.pi / resolution)
-            ]
+    def points_along(self, ws) -> np.ndarray:
+        "Points at every distance in an array along the circle, as an (N, 2) array"
+        return self.coordinates_at_angles(
+            self.angle_along(np.asarray(ws, dtype=np.float64))
+        )
+
+    def segments_for_tolerance(
+        self, tolerance=default_flattening_tolerance, angleSize=2 * math.pi
+    ) -> int:
+        "How many equal chords across angleSize stay within tolerance of the circle"
+        if tolerance >= self.radius:
+            return max(1, math.ceil(abs(angleSize) / math.pi))
+        # A chord spanning angle a strays radius * (1 - cos(a / 2)) from the circle
+        largest_step = 2 * math.acos(1 - tolerance / self.radius)
+        return max(1, math.ceil(abs(angleSize) / largest_step))
+
+    def flatten(self, tolerance=default_flattening_tolerance) -> np.ndarray:
+        "Just enough points around the circle for tolerance, not repeating the first"
+        segments = max(3, self.segments_for_tolerance(tolerance))
+        return self.coordinates_at_angles(
+            np.arange(segments) * (2 * math.pi / segments)
         )
+
+    def iteratePoints(self, resolution, startAngle=0, endAngle=2 * math.pi):
+        step = (endAngle - startAngle) / resolution
+        for x, y in self.coordinates_at_angles(
+            np.arange(startAngle, endAngle, step)
+        ).tolist():
+            yield Vector(x, y)
+
+    def polyline(self, resolution=None, tolerance=default_flattening_tolerance):
+        "Regular polygon with resolution sides, or as many as keep it within tolerance"
+        if resolution is None:
+            coordinates = self.flatten(tolerance)
+        else:
+            coordinates = self.coordinates_at_angles(
+                np.arange(0, 2 * math.pi, 2 * math.pi / resolution)
+            )
+        shape = Shape(coordinates)
         shape.close()
         return shape
 
+    def arc(self, startAngle: float, endAngle: float):
+        from src.geometry.Arc import Arc
+
+        return Arc(self.center, self.radius, startAngle, endAngle)
 
-def arc(center: Vector, radius: float, startAngle=0.0, angleSize=2.0 * math.pi):
-    circle = Circle(center, radius)
-    step = angleSize / 100.0
-    shape = Shape()
-    for angle in np.arange(startAngle, startAngle + angleSize, step):
-        point = circle.pointAtAngle(angle)
-        shape.lineTo(point)
 
-    return shape
+def arc(
+    center: Vector,
+    radius: float,
+    startAngle=0.0,
+    angleSize=2.0 * math.pi,
+    tolerance=default_flattening_tolerance,
+):
+    "Polyline around part of a circle, from startAngle anticlockwise by angleSize"
+    return (
+        Circle(center, radius).arc(startAngle, startAngle + angleSize).shape(tolerance)
+    )
@@ -1,5 +1,5 @@
-import drawSvg as svg
 from src.geometry.Abstract_Group import Abstract_Group
+from src.geometry.Rectangle import Rectangle, minimumBoundingRect
 from src.geometry.Vector import Vector
 
 from src.geometry.isMovable import isMovable
@@ -18,29 +18,33 @@ class Group(Abstract_Group):
         for object in objects:
             self.append(object)
 
+    def bounding_rect(self) -> Rectangle:
+        "Combine the (cached) bounding rectangles of every object in the group"
+        return minimumBoundingRect(list(self.iterate_objects()))
+
     @property
     def left(self) -> float:
-        return min([obj.left for obj in self.iterate_objects()])
+        return self.bounding_rect().left
 
     @property
     def right(self) -> float:
-        return max([obj.right for obj in self.iterate_objects()])
+        return self.bounding_rect().right
 
     @property
     def top(self) -> float:
-        return max([obj.top for obj in self.iterate_objects()])
+        return self.bounding_rect().top
 
     @property
     def bottom(self) -> float:
-        return min([obj.bottom for obj in self.iterate_objects()])
+        return self.bounding_rect().bottom
 
     @property
     def width(self):
-        return self.right - self.left
+        return self.bounding_rect().width
 
     @property
     def height(self):
-        return self.top - self.bottom
+        return self.bounding_rect().height
 
     def midpoint(self):
         sum = Vector(0, 0)
@@ -49,19 +53,46 @@ class Group(Abstract_Group):
         return sum / len(self.objects)
 
     def svg_label(self):
+        import drawSvg as svg
+
         if self.label:
             midpoint = self.midpoint()
             return svg.Text(
                 self.label, 12, midpoint.x, midpoint.y, fill="#000000", stroke="none"
             )
 
+    def content_hash(self) -> str | None:
+        "Hash of the label and every object's hash, or None if any object hasn't one"
+        from src.svg_cache import content_hash, object_hash
+
+        hashes = [object_hash(obj) for obj in self.iterate_objects()]
+        if None in hashes:
+            return None
+        return content_hash("Group", repr(self.label), *hashes)
+
     def svg(self):
-        g = svg.Group([obj.svg() for obj in self.iterate_objects()])
+        import drawSvg as svg
+
+        from src.svg_cache import cached_svg
+
+        g = svg.Group([cached_svg(obj) for obj in self.iterate_objects()])
         label = self.svg_label()
         if label:
             g.append(label)
         return g
 
+    def write_svg(self, writer):
+        "Stream the group to an SvgWriter, one object at a time"
+        writer.begin_group()
+        for obj in self.iterate_objects():
+            writer.object(obj)
+        if self.label:
+            midpoint = self.midpoint()
+            writer.text(
+                self.label, 12, midpoint.x, midpoint.y, fill="#000000", stroke="none"
+            )
+        writer.end_group()
+
     def move(self, x: float, y: float):
         return Group(
             *[
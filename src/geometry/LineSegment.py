@@ -1,5 +1,3 @@
-import drawSvg as draw
-
 from src.geometry.Line import StraightLine
 from src.geometry.Vector import Vector, distance
 from src.constants import global_tolerance
@@ -85,6 +83,8 @@ class LineSegment:
         return LineSegment(start=start, end=start + direction)
 
     def svg(self, **kwargs):
+        import drawSvg as draw
+
         return draw.Line(self.start.x, self.start.y, self.end.x, self.end.y, **kwargs)
 
     # Bounding rectangle methods
@@ -174,32 +174,18 @@ class LineSegment:
             return False
 
     def closestPoint(self, X: Vector) -> Vector:
-        # TODO: there is so much that could be more efficient here!
-        if self.is_vertical():
-            x = self.start.x
-            if X.y < self.bottom:
-                return Vector(x, self.bottom)
-            elif X.y > self.top:
-                return Vector(x, self.top)
-            else:
-                return Vector(self.start.x, X.y)
-
-        normal = self.normal()
-        Y = self.extrapolatedIntersection(LineSegment(X, X + normal))
-        if not Y:
-            raise Exception("Something unexpected went wrong")
-
-
-        P = self.start
-        Q = self.end
-        x = (Y.x - P.x) / (Q.x - P.x)
-
-        if x < 0:
-            return P
-        elif x > 1:
-            return Q
+        "Project X onto the line, clamped to the ends of the segment"
+        vx = self.end.x - self.start.x
+        vy = self.end.y - self.start.y
+        t = ((X.x - self.start.x) * vx + (X.y - self.start.y) * vy) / (
+            vx * vx + vy * vy
+        )
+        if t <= 0:
+            return self.start
+        elif t >= 1:
+            return self.end
         else:
-            return Y
+            return Vector(self.start.x + t * vx, self.start.y + t * vy)
 
     def is_vertical(self):
         return self.start.x == self.end.x
@@ -23,11 +23,23 @@ class Rectangle:
         )
 
 
+def bounding_rect(object) -> Rectangle:
+    "Bounding rectangle of any object with top, bottom, left and right"
+    method = getattr(object, "bounding_rect", None)
+    if callable(method):
+        # Shapes, groups and notches keep their bounds cached
+        return method()
+    return Rectangle(
+        left=object.left, top=object.top, right=object.right, bottom=object.bottom
+    )
+
+
 def minimumBoundingRect(objects) -> Rectangle:
     "Find the minimum bounds rectangle of many objects"
+    rects = [bounding_rect(object) for object in objects]
     return Rectangle(
-        top=max([object.top for object in objects]),
-        bottom=min([object.bottom for object in objects]),
-        left=min([object.left for object in objects]),
-        right=max([object.right for object in objects]),
+        top=max([rect.top for rect in rects]),
+        bottom=min([rect.bottom for rect in rects]),
+        left=min([rect.left for rect in rects]),
+        right=max([rect.right for rect in rects]),
     )
@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+
+# Below this many segments it is quicker to check every segment than to use the grid
+brute_force_limit = 64
+
+
+def closest_points_on_segments(
+    points: np.ndarray, starts: np.ndarray, ends: np.ndarray
+):
+    "Closest point on each segment to each point (arrays broadcast against each other)"
+    vectors = ends - starts
+    lengths_squared = np.sum(vectors * vectors, axis=-1)
+    t = np.sum((points - starts) * vectors, axis=-1) / np.where(
+        lengths_squared > 0, lengths_squared, 1.0
+    )
+    t = t[..., np.newaxis]
+    # Use the end points themselves when clamped, so they come out exact
+    return np.where(t <= 0, starts, np.where(t >= 1, ends, starts + t * vectors))
+
+
+class SegmentGrid:
+    """A uniform grid over the line segments of a polyline.
+
+    Each segment is registered in every cell its bounding box overlaps. Finding
+    the closest segment to a point then only has to check the cells in rings
+    around that point, until no unchecked cell could hold anything closer.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        self.starts = starts
+        self.ends = ends
+
+        lower = np.minimum(starts, ends)
+        upper = np.maximum(starts, ends)
+        self.origin = lower.min(axis=0)
+        extent = upper.max(axis=0) - self.origin
+
+        # About one segment per cell, but no cells smaller than a typical segment
+        number_of_segments = len(starts)
+        typical_length = float(np.mean(np.hypot(*(upper - lower).T)))
+        cell_size = max(
+            math.sqrt(extent[0] * extent[1] / number_of_segments), typical_length
+        )
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+        self.shape = (extent // self.cell_size).astype(int) + 1
+
+        low_cells = self.cell_of(lower)
+        high_cells = self.cell_of(upper)
+        spans = high_cells - low_cells + 1
+        counts = spans[:, 0] * spans[:, 1]
+
+        # One (cell, segment) pair for every cell each segment's bounding box covers
+        segment_ids = np.repeat(np.arange(number_of_segments), counts)
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        k = np.arange(len(segment_ids)) - first
+        xs = low_cells[segment_ids, 0] + k % spans[segment_ids, 0]
+        ys = low_cells[segment_ids, 1] + k // spans[segment_ids, 0]
+        cell_ids = xs * self.shape[1] + ys
+
+        order = np.argsort(cell_ids, kind="stable")
+        self.cell_segments = segment_ids[order]
+        self.cell_starts = np.searchsorted(
+            cell_ids[order], np.arange(self.shape[0] * self.shape[1] + 1)
+        )
+
+    def cell_of(self, points: np.ndarray) -> np.ndarray:
+        "Grid cell containing each point, clamped to the grid"
+        cells = np.floor((points - self.origin) / self.cell_size).astype(int)
+        return np.clip(cells, 0, self.shape - 1)
+
+    def segments_in_cells(self, cell_ids: np.ndarray) -> np.ndarray:
+        "Indices of every segment registered in any of the given cells"
+        starts = self.cell_starts[cell_ids]
+        counts = self.cell_starts[cell_ids + 1] - starts
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        k = np.arange(counts.sum()) - first
+        return self.cell_segments[np.repeat(starts, counts) + k]
+
+    def ring(self, cx: int, cy: int, r: int) -> np.ndarray:
+        "Ids of the grid cells which are exactly r cells away from (cx, cy)"
+        if r == 0:
+            xs, ys = np.array([cx]), np.array([cy])
+        else:
+            across = np.arange(cx - r, cx + r + 1)
+            down = np.arange(cy - r + 1, cy + r)
+            xs = np.concatenate(
+                [across, across, np.full(len(down), cx - r), np.full(len(down), cx + r)]
+            )
+            ys = np.concatenate(
+                [np.full(len(across), cy - r), np.full(len(across), cy + r), down, down]
+            )
+        inside = (xs >= 0) & (xs < self.shape[0]) & (ys >= 0) & (ys < self.shape[1])
+        return xs[inside] * self.shape[1] + ys[inside]
+
+    def closest(self, point: np.ndarray):
+        "Distance, segment index and closest point on the polyline to a single point"
+        cx, cy = np.floor((point - self.origin) / self.cell_size).astype(int).tolist()
+        nx, ny = self.shape.tolist()
+        # Skip the rings which don't reach the grid, stop once they cover all of it
+        first_ring = max(0, -cx, cx - (nx - 1), -cy, cy - (ny - 1))
+        last_ring = max(cx, nx - 1 - cx, cy, ny - 1 - cy)
+
+        best_distance, best_index, best_point = math.inf, -1, None
+        for r in range(first_ring, last_ring + 1):
+            candidates = self.segments_in_cells(self.ring(cx, cy, r))
+            if len(candidates):
+                closest = closest_points_on_segments(
+                    point, self.starts[candidates], self.ends[candidates]
+                )
+                distances = np.hypot(*(closest - point).T)
+                # Prefer the earliest segment when distances are equal
+                order = np.lexsort((candidates, distances))[0]
+                distance, index = float(distances[order]), int(candidates[order])
+                if distance < best_distance or (
+                    distance == best_distance and index < best_index
+                ):
+                    best_distance, best_index, best_point = (
+                        distance,
+                        index,
+                        closest[order],
+                    )
+            # Anything in a cell we haven't checked is at least this far away
+            if best_distance < r * self.cell_size:
+                break
+        return best_distance, best_index, best_point
+
+    def closest_many(self, points: np.ndarray):
+        "Distances, segment indices and closest points on the polyline to many points"
+        distances = np.empty(len(points))
+        indices = np.empty(len(points), dtype=int)
+        closest = np.empty((len(points), 2))
+        if len(self.starts) <= brute_force_limit:
+            # Check every segment, a chunk of points at a time to bound memory
+            chunk = max(1, 2**16 // len(self.starts))
+            for i in range(0, len(points), chunk):
+                query = points[i : i + chunk, np.newaxis]
+                candidates = closest_points_on_segments(query, self.starts, self.ends)
+                d = np.hypot(*np.moveaxis(candidates - query, -1, 0))
+                # argmin picks the earliest segment when distances are equal
+                best = np.argmin(d, axis=1)
+                rows = np.arange(len(best))
+                distances[i : i + chunk] = d[rows, best]
+                indices[i : i + chunk] = best
+                closest[i : i + chunk] = candidates[rows, best]
+        else:
+            for i, point in enumerate(points):
+                distances[i], indices[i], closest[i] = self.closest(point)
+        return distances, indices, closest
@@ -1,70 +1,260 @@
 import math
-from typing import List
+from typing import Iterable, List
 
-import drawSvg as draw
 import numpy as np
-import collision
 
 from src.geometry.Intersection import Intersection
 from src.geometry.LineSegment import LineSegment
+from src.geometry.Rectangle import Rectangle
+from src.geometry.offset import (
+    default_miter_limit,
+    offset_coordinates,
+    offset_coordinates_many,
+)
+from src.geometry.SegmentGrid import SegmentGrid, closest_points_on_segments
+from src.geometry.angles import normalize_angles
 from src.geometry.vec3 import vec3
 from src.geometry.Vector import Vector, distance
 from src.competition import competition, multiwinner_competition
+from src.constants import default_flattening_tolerance, global_tolerance
+from src.svg_writer import format_numbers, polyline_path_data
 
 
 default_corner_threshold = math.radians(15)
 
+# Svg attributes of the styles which are drawn as nothing more than a path
+streamed_svg_styles = {
+    "line": dict(fill="none", stroke="black"),
+    "dashed": dict(fill="none", stroke="black", stroke_dasharray="3"),
+    "polygon": dict(fill="#E6E6FA66", stroke="black"),
+}
+
+
+def _draw():
+    "drawSvg, which is slow to import, so only imported once something is drawn"
+    import drawSvg
+
+    return drawSvg
+
+
+def as_coordinates(points: "Iterable[Vector] | np.ndarray") -> np.ndarray:
+    "Convert some points (or a coordinate array) into a new (N, 2) float64 array"
+    if isinstance(points, np.ndarray):
+        return np.array(points, dtype=np.float64).reshape(-1, 2)
+    return np.array([(p.x, p.y) for p in points], dtype=np.float64).reshape(-1, 2)
+
+
+def vectors(coordinates: np.ndarray) -> List[Vector]:
+    "Convert an (N, 2) coordinate array into a list of Vector objects"
+    return [Vector(x, y) for x, y in coordinates.tolist()]
+
+
+class PointsAlongShape:
+    "Many positions along a Shape at once, stored as parallel arrays"
+
+    def __init__(
+        self,
+        distances: np.ndarray,
+        indices: np.ndarray,
+        remainders: np.ndarray,
+        points: np.ndarray,
+        tangents: np.ndarray,
+        normals: np.ndarray,
+    ):
+        self.distances = distances
+        self.indices = indices
+        self.remainders = remainders
+        self.points = points
+        self.tangents = tangents
+        self.normals = normals
+
+    def __len__(self):
+        return len(self.distances)
+
+
+class SideTable:
+    "The sides of a shape along with their centroids"
+
+    def __init__(self, sides: List["Shape"]):
+        self.sides = sides
+        self._centroids = None
+
+    @property
+    def centroids(self) -> np.ndarray:
+        "The center of mass of every side as an (N, 2) array, found when it's needed"
+        if self._centroids is None:
+            self._centroids = np.array(
+                [side.center_of_mass().tuple for side in self.sides], dtype=np.float64
+            ).reshape(-1, 2)
+        return self._centroids
+
+    def best(self, scores: np.ndarray) -> "Shape":
+        "A copy of the side with the highest score (the first one if there's a tie)"
+        winner = competition(range(len(self.sides)), lambda i: scores[i])
+        return self.sides[winner].copy()
+
+    def lowest(self, scores: np.ndarray, number_of_sides: int) -> List["Shape"]:
+        "Copies of the sides with the lowest scores, in order"
+        winners = multiwinner_competition(
+            range(len(self.sides)), lambda i: scores[i], number_of_sides
+        )
+        return [self.sides[i].copy() for i in winners]
+
 
 class Shape:
-    "As opposed to a monogamous line. This represents a shape made by many line segments joined end to end."
-    points: List[Vector]
+    """As opposed to a monogamous line. This represents a shape made by many line
+    segments joined end to end.
+
+    The geometry is stored as a single (N, 2) float64 array of coordinates. The
+    `points` property converts this into Vector objects for drafting scripts.
+
+    Segments drawn with curve_to or arc_to are kept as curves between two of
+    those points, and only flattened into line segments when something needs
+    the coordinates. Svg output draws them as real curves.
+    """
+
     style: str
     label: str | None = None
+    flattening_tolerance = default_flattening_tolerance
 
     # Construction
     def __init__(self, points=[], label=None, style="line"):
         self.label = label
         self.style = style
-        self.points = [point.copy() for point in points]
+        self._set_coordinates(as_coordinates(points))
         self.fix_points()
 
+    def _set_coordinates(self, coordinates: np.ndarray):
+        # The buffer may have spare rows at the end so that appending is cheap
+        self._buffer = coordinates
+        self._vertices = coordinates
+        # Curved segments, keyed by the index of the vertex they start from
+        self._curves = {}
+        self._invalidate()
+
+    def _invalidate(self):
+        "Forget everything that was calculated from the points, they have changed"
+        self._segment_lengths = None
+        self._cumulative_lengths = None
+        self._segment_grid = None
+        self._polygon_edges = None
+        self._bounds = None
+        self._turning_angles = None
+        self._side_tables = {}
+        self._flattened = None
+        self._geometry_hash = None
+
+    @property
+    def _coordinates(self) -> np.ndarray:
+        "Every point, with any curved segments flattened into line segments"
+        if not self._curves:
+            return self._vertices
+        if self._flattened is None:
+            self._flattened = self._flatten_curves()
+        return self._flattened
+
+    def _flatten_curves(self) -> np.ndarray:
+        vertices = self._vertices
+        pieces = [vertices[:1]]
+        previous = 0
+        for index in sorted(self._curves):
+            # Keep the vertices exactly, only the points inbetween come from the curve
+            inbetween = self._curves[index].flatten(self.flattening_tolerance)[1:-1]
+            pieces += [vertices[previous + 1 : index + 1], inbetween]
+            previous = index
+        pieces.append(vertices[previous + 1 :])
+        return np.concatenate(pieces)
+
+    @property
+    def has_curves(self) -> bool:
+        return bool(self._curves)
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        "Read-only (N, 2) array of the x, y coordinates of every point"
+        view = self._coordinates.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def points(self) -> List[Vector]:
+        return vectors(self._coordinates)
+
+    @points.setter
+    def points(self, points):
+        self._set_coordinates(as_coordinates(points))
+
     def check_points(self):
-        for a, b, i in zip(self.points, self.points[1:], range(0, len(self.points))):
-            if a == b:
-                raise Exception("We have duplicate points at position {}".format(i))
+        c = self._coordinates
+        duplicates = np.flatnonzero(np.all(c[1:] == c[:-1], axis=1))
+        if len(duplicates):
+            raise Exception(
+                "We have duplicate points at position {}".format(duplicates[0])
+            )
 
     def fix_points(self):
-        points = []
-        for p in self.points:
-            if len(points) == 0 or p != points[len(points) - 1]:
-                points.append(p)
-        self.points = points
+        c = self._vertices
+        if len(c) > 1:
+            keep = np.ones(len(c), dtype=bool)
+            keep[1:] = np.any(c[1:] != c[:-1], axis=1)
+            # A curve can end where it started, like a whole circle
+            keep[[index + 1 for index in self._curves]] = True
+            if not keep.all():
+                self._set_vertices_keeping_curves(c[keep], np.cumsum(keep) - 1)
+
+    def _set_vertices_keeping_curves(self, coordinates: np.ndarray, new_indices):
+        "Replace the vertices, moving each curve to new_indices[its old vertex]"
+        curves = self._curves
+        self._set_coordinates(coordinates)
+        self._curves = {
+            int(new_indices[index]): curve for index, curve in curves.items()
+        }
 
     def copy(self):
-        return Shape(points=self.points, label=self.label, style=self.style)
+        shape = Shape(label=self.label, style=self.style)
+        shape._set_coordinates(self._vertices.copy())
+        shape._curves = dict(self._curves)
+        return shape
+
+    def _point(self, index: int) -> Vector:
+        x, y = self._coordinates[index].tolist()
+        return Vector(x, y)
 
     def firstPoint(self):
-        return self.points[0]
+        return self.first_point
+
+    def _end_point(self, index: int) -> Vector:
+        # The ends are never part of a curve, so they don't need flattening
+        x, y = self._vertices[index].tolist()
+        return Vector(x, y)
 
     @property
     def first_point(self):
-        return self.points[0]
+        return self._end_point(0)
 
     @property
     def last_point(self):
-        if len(self.points) == 0:
+        if len(self._vertices) == 0:
             raise Exception("No points in the shape!")
-        return self.points[-1]
+        return self._end_point(-1)
 
     # deprecated
     def lastPoint(self):
         return self.last_point
 
     def append(self, p):
-        self.points.append(Vector(p.x, p.y))
+        n = len(self._vertices)
+        if n == len(self._buffer):
+            # Grow the buffer geometrically so repeated appends stay cheap
+            buffer = np.empty((max(8, 2 * n), 2), dtype=np.float64)
+            buffer[:n] = self._vertices
+            self._buffer = buffer
+        self._buffer[n] = (p.x, p.y)
+        self._vertices = self._buffer[: n + 1]
+        self._invalidate()
 
     def start_at(self, p):
-        self.points = [p.copy()]
+        self._set_coordinates(as_coordinates([p]))
         return self
 
     def startAt(self, p):
@@ -72,7 +262,8 @@ class Shape:
         return self.start_at(p)
 
     def line_to(self, p):
-        if len(self.points) == 0 or self.lastPoint() != p:
+        n = len(self._vertices)
+        if n == 0 or self._vertices[n - 1].tolist() != [p.x, p.y]:
             self.append(p)
         return self
 
@@ -85,14 +276,24 @@ class Shape:
         # First decide which side to start with
         distance_to_first = distance(self.last_point, other.first_point)
         distance_to_last = distance(self.last_point, other.last_point)
-        points_to_add = (
-            other.points
+        coordinates_to_add = (
+            other._coordinates
             if distance_to_last > distance_to_first
-            else reversed(other.points)
+            else other._coordinates[::-1]
         )
         # Then draw a line through all the points
-        for point in points_to_add:
-            self.line_to(point)
+        return self.line_through_coordinates(coordinates_to_add)
+
+    def line_through_coordinates(self, coordinates: np.ndarray):
+        "Draw a line through the rows of an (N, 2) array, skipping repeats like line_to"
+        coordinates = as_coordinates(coordinates)
+        n = len(self._vertices)
+        joined = np.concatenate([self._vertices, coordinates])
+        start = max(n, 1)
+        keep = np.ones(len(joined), dtype=bool)
+        keep[start:] = np.any(joined[start:] != joined[start - 1 : -1], axis=1)
+        # The points already in the shape are all kept, so its curves stay put
+        self._set_vertices_keeping_curves(joined[keep], np.arange(n))
         return self
 
     def line_through(self, *shapes):
@@ -119,31 +320,55 @@ class Shape:
         "deprecated alias for line_to"
         return self.line_to(p)
 
-    def curveTo(self, p: Vector, curve=0):
-        # TODO: Create the actual curve
+    def _append_curve(self, curve, p: Vector):
+        self._curves[len(self._vertices) - 1] = curve
         self.append(p)
         return self
 
+    def curve_to(self, p: Vector, control1: Vector, control2: Vector):
+        "Continue with a cubic bezier curve to p"
+        from src.geometry.bezier import BezierCurve
+
+        return self._append_curve(BezierCurve(self.end(), control1, control2, p), p)
+
+    def curveTo(self, p: Vector, curve=0):
+        """Continue to p, bulging curve mm to the left of the straight line there.
+
+        With no curve this is just a line.
+        """
+        if curve == 0:
+            return self.line_to(p)
+        start = self.end()
+        chord = p - start
+        # Guides pushed out by 4/3 of the bulge put the middle of the curve at the bulge
+        bulge = chord.normal().withLength(curve * 4 / 3)
+        return self.curve_to(
+            p, start + chord / 3 + bulge, start + chord * 2 / 3 + bulge
+        )
+
+    def arc_to(self, center: Vector, angleSize: float):
+        "Continue around a circle about center, anticlockwise by angleSize radians"
+        from src.geometry.Arc import Arc
+
+        start = self.end()
+        startAngle = math.atan2(start.y - center.y, start.x - center.x)
+        arc = Arc(center, distance(center, start), startAngle, startAngle + angleSize)
+        return self._append_curve(arc, arc.end)
+
     def continue_with_arc(self, radius, angleSize):
         normal = self.lastSegment().normal().unitVector()
         center = normal * radius + self.end()
-        startAngle = normal.angle - math.pi
-        from src.geometry.Circle import arc
-
-        shape = arc(center, radius, startAngle, angleSize)
-        for point in shape.points:
-            self.lineTo(point)
-        return self
+        return self.arc_to(center, angleSize)
 
     def close(self):
-        if self.end() != self.start():
+        if not self.closed:
             self.append(self.start())
         self.style = "polygon"
         return self
 
     @property
     def closed(self) -> bool:
-        return self.first_point == self.last_point
+        return bool(np.all(self._vertices[0] == self._vertices[-1]))
 
     @property
     def is_closed(self):
@@ -151,8 +376,7 @@ class Shape:
 
     def first_point_is_a_corner(self, threshhold=default_corner_threshold):
         if self.is_closed:
-            intersection = Intersection(self.points[-2], self.points[0], self.points[1])
-            return abs(intersection.angle) > threshhold
+            return bool(abs(self.turning_angles()[0]) > threshhold)
         else:
             return False
 
@@ -169,32 +393,32 @@ class Shape:
         return copy
 
     def reverse(self):
-        return Shape(reversed(self.points), label=self.label, style=self.style)
+        return Shape(self._coordinates[::-1], label=self.label, style=self.style)
 
     def close_by_mirroring_over_y_axis(self):
         copy = self.copy()
-        for point in reversed(self.points):
-            copy.lineTo(Vector(-point.x, point.y))
+        copy.line_through_coordinates(self._coordinates[::-1] * (-1.0, 1.0))
         copy.close()
         return copy
 
     # Iteration
     def segments(self):
         "Iterate line segments"
-        for start, end in zip(self.points, self.points[1:]):
+        points = self.points
+        for start, end in zip(points, points[1:]):
             if start != end:
                 yield LineSegment(start, end)
 
     def segment(self, index):
-        return LineSegment(start=self.points[index], end=self.points[index + 1])
+        return LineSegment(start=self._point(index), end=self._point(index + 1))
 
     @property
     def numberOfSegments(self):
-        return len(self.points) - 1
+        return len(self._coordinates) - 1
 
     @property
     def number_of_points(self):
-        return len(self.points)
+        return len(self._coordinates)
 
     @property
     def has_no_points(self):
@@ -216,13 +440,34 @@ class Shape:
         "deprecated alias for last_segment property"
         return self.last_segment
 
+    def segment_lengths(self) -> np.ndarray:
+        "Array of the length of every line segment"
+        if self._segment_lengths is None:
+            dx, dy = np.diff(self._coordinates, axis=0).T
+            lengths = np.sqrt(dx * dx + dy * dy)
+            lengths.flags.writeable = False
+            self._segment_lengths = lengths
+        return self._segment_lengths
+
+    def cumulative_lengths(self) -> np.ndarray:
+        """Array of the distance along the polyline to every point.
+
+        This is calculated once and kept until the points change, so that measuring
+        along the shape is a bisection instead of a walk over every segment.
+        """
+        if self._cumulative_lengths is None:
+            cumulative = np.zeros(len(self._coordinates))
+            # cumsum adds in order like the old loop, so rounding doesn't change lengths
+            np.cumsum(self.segment_lengths(), out=cumulative[1:])
+            cumulative.flags.writeable = False
+            self._cumulative_lengths = cumulative
+        return self._cumulative_lengths
+
     @property
     def length(self):
         "Measure the total length of the poly line"
-        sum = 0.0
-        for segment in self.segments():
-            sum += segment.length
-        return sum
+        cumulative = self.cumulative_lengths()
+        return float(cumulative[-1]) if len(cumulative) else 0.0
 
     # TODO: Probably doesnt make sense for this to be a subclass any more
     # TODO: Define this class as a point a certain length along a line
@@ -248,6 +493,8 @@ class Shape:
             return self.segment.normalAlong(self.remainder)
 
         def svg(self):
+            draw = _draw()
+
             marker = self.normal().withLength(-3)
             textPath = marker.withLength(100).translate(
                 marker.vector.withLength(marker.length + 1)
@@ -289,32 +536,76 @@ class Shape:
         def width(self):
             return self.right - self.left
 
-    def measureAlong(self, w: float | int):
-        sum = 0
-        i = 0
-        for segment in self.segments():
-            if sum + segment.length < w:
-                sum += segment.length
-            else:
-                return self.MeasurementAlongShape(self, w, i, w - sum)
-            i += 1
-        # otherwise
-        raise ValueError(
-            "shape.measureAlong out of bounds. Expected 0 to {}, got {}".format(
-                self.length, w
+    def segment_index_along(self, w: float | int) -> int:
+        "Index of the segment which is w millimeters along the polyline"
+        cumulative = self.cumulative_lengths()
+        # The first segment whose end is at least w along
+        i = int(np.searchsorted(cumulative[1:], w, side="left"))
+        if i >= len(cumulative) - 1:
+            raise ValueError(
+                "shape.measureAlong out of bounds. Expected 0 to {}, got {}".format(
+                    self.length, w
+                )
             )
+        return i
+
+    def measureAlong(self, w: float | int):
+        i = self.segment_index_along(w)
+        return self.MeasurementAlongShape(
+            self, w, i, w - float(self.cumulative_lengths()[i])
         )
 
     def point_along(self, w) -> Vector:
         "Find a point a certain distance along the polyline"
-        return self.measureAlong(w).point
+        i = self.segment_index_along(w)
+        remainder = w - float(self.cumulative_lengths()[i])
+        if remainder < 0:
+            raise ValueError("Remainder should be greater than 0, got", remainder)
+        (x0, y0), (x1, y1) = self._coordinates[i : i + 2].tolist()
+        progress = remainder / float(self.segment_lengths()[i])
+        return Vector(
+            x0 * (1.0 - progress) + x1 * progress,
+            y0 * (1.0 - progress) + y1 * progress,
+        )
 
     def pointAlong(self, w) -> Vector:
         "deprecated alias for point_along"
         return self.point_along(w)
 
+    def points_along(self, ws) -> PointsAlongShape:
+        """Find many points along the polyline at once.
+
+        Returns the points, segment indices, unit tangents and unit normals for
+        every distance in `ws` as arrays.
+        """
+        ws = np.asarray(ws, dtype=np.float64).reshape(-1)
+        cumulative = self.cumulative_lengths()
+        indices = np.searchsorted(cumulative[1:], ws, side="left")
+        if len(ws) and (indices.max() >= len(cumulative) - 1 or ws.min() < 0):
+            raise ValueError(
+                "shape.points_along out of bounds. "
+                "Expected 0 to {}, got {} to {}".format(self.length, ws.min(), ws.max())
+            )
+        remainders = ws - cumulative[indices]
+        lengths = self.segment_lengths()[indices]
+        starts = self._coordinates[indices]
+        ends = self._coordinates[indices + 1]
+        progress = (remainders / lengths)[:, np.newaxis]
+        points = starts * (1.0 - progress) + ends * progress
+        tangents = (ends - starts) * (1.0 / lengths)[:, np.newaxis]
+        normals = tangents[:, ::-1] * (-1.0, 1.0)
+        return PointsAlongShape(ws, indices, remainders, points, tangents, normals)
+
     def evenlySpacedMeasurements(self, step=10):
-        return [self.measureAlong(w) for w in np.arange(0, self.length, step)]
+        along = self.points_along(np.arange(0, self.length, step))
+        return [
+            self.MeasurementAlongShape(self, w, i, remainder)
+            for w, i, remainder in zip(
+                along.distances.tolist(),
+                along.indices.tolist(),
+                along.remainders.tolist(),
+            )
+        ]
 
     def upsample(self):
         "Interpolate between the points to create a new poly line with greater resolution"
@@ -322,11 +613,9 @@ class Shape:
 
     def resample(self, interval):
         "Increase the resolution of the line, but no gaurantee for keeping the original points"
-        points = []
-        for l in np.arange(0, self.length, interval):
-            points.append(self.at(l).point)
-        if points[-1] != self.points[-1]:
-            points.append(self.points[-1].copy())
+        points = self.points_along(np.arange(0, self.length, interval)).points
+        if np.any(points[-1] != self._coordinates[-1]):
+            points = np.concatenate([points, self._coordinates[-1:]])
         return Shape(points)
 
     def proximity(self, p):
@@ -345,20 +634,31 @@ class Shape:
         normal = tangent.normal()
         return normal
 
+    def bounding_rect(self) -> Rectangle:
+        "The smallest rectangle containing every point, kept until the points change"
+        if self._bounds is None:
+            (left, bottom), (right, top) = (
+                self._coordinates.min(axis=0).tolist(),
+                self._coordinates.max(axis=0).tolist(),
+            )
+            self._bounds = (left, top, right, bottom)
+        left, top, right, bottom = self._bounds
+        return Rectangle(left=left, top=top, right=right, bottom=bottom)
+
     @property
     def top(self) -> float:
         "y coordinate of the topmost point"
-        return max([point.y for point in self.points])
+        return self.bounding_rect().top
 
     @property
     def bottom(self) -> float:
         "y coordinate of the bottom-most point"
-        return min([point.y for point in self.points])
+        return self.bounding_rect().bottom
 
     @property
     def left(self) -> float:
         "x coordinate of the left-most point"
-        return min([point.x for point in self.points])
+        return self.bounding_rect().left
 
     def set_left(self, value: float):
         return self.translate(Vector(value - self.left, 0))
@@ -366,7 +666,7 @@ class Shape:
     @property
     def right(self) -> float:
         "x coordinate of the right-most point"
-        return max([point.x for point in self.points])
+        return self.bounding_rect().right
 
     @property
     def bottom_left(self):
@@ -386,7 +686,7 @@ class Shape:
 
     @property
     def width(self) -> float:
-        return self.right - self.left
+        return self.bounding_rect().width
 
     def leftmost_point_at_y_position(self, y):
         winner = None
@@ -434,30 +734,79 @@ class Shape:
 
     @property
     def height(self) -> float:
-        return self.top - self.bottom
+        return self.bounding_rect().height
 
     def start(self) -> Vector:
-        return self.points[0]
+        return self._end_point(0)
 
     def end(self) -> Vector:
-        return self.points[-1]
+        return self._end_point(-1)
 
     # Exporting
     def interleavedCoordinates(self):
-        for point in self.points:
-            yield point.x
-            yield point.y
+        yield from self._coordinates.ravel().tolist()
+
+    def svg_path_data(self, close=False, precision=None, relative=False) -> str:
+        """The `d` attribute of an svg <path> through all the points.
+
+        Coordinates can be rounded to some decimal places, and given relative to
+        the point before, for smaller files.
+        """
+        if not self._curves:
+            d = polyline_path_data(self._vertices, precision, relative)
+        else:
+            # svg has the y axis pointing downwards
+            flipped = self._vertices * (1.0, -1.0)
+            if precision is not None:
+                flipped = np.round(flipped, precision)
+            numbers = format_numbers(flipped, precision)
+            commands = ["M{},{}".format(numbers[0], numbers[1])]
+            for i in range(1, len(flipped)):
+                curve = self._curves.get(i - 1)
+                if curve is not None:
+                    # Curves are always given in absolute coordinates
+                    commands.append(curve.svg_path_command(precision))
+                elif relative:
+                    step = format_numbers(flipped[i] - flipped[i - 1], precision)
+                    commands.append("l{},{}".format(*step))
+                else:
+                    commands.append("L{},{}".format(numbers[2 * i], numbers[2 * i + 1]))
+            d = " ".join(commands)
+        if close:
+            d += " Z"
+        return d
+
+    def content_hash(self) -> str:
+        "Hash of all that changes how the shape is drawn, including style and label"
+        from src.svg_cache import content_hash
+
+        if self._geometry_hash is None:
+            curves = " ".join(
+                "{}:{}".format(index, self._curves[index].svg_path_command())
+                for index in sorted(self._curves)
+            )
+            self._geometry_hash = content_hash(
+                np.ascontiguousarray(self._vertices, dtype=np.float64).tobytes(),
+                curves,
+                repr(self.flattening_tolerance),
+            )
+        # Style and label are plain attributes, so they can't be part of the cached hash
+        return content_hash("Shape", self._geometry_hash, self.style, repr(self.label))
 
     def labelText(self) -> str | None:
         return self.label
 
     def with_style(self, style: str):
         "Create a copy using a different style"
-        return Shape(points=self.points, label=self.label, style=style)
+        shape = self.copy()
+        shape.style = style
+        return shape
 
     def with_label(self, label: str):
         "Create a copy with a new label applied"
-        return Shape(points=self.points, label=label, style=self.style)
+        shape = self.copy()
+        shape.label = label
+        return shape
 
     def svg(self):
         "drawSvg object representation"
@@ -488,7 +837,30 @@ class Shape:
         else:
             raise ValueError("Unable to render unexpected polyline style:", self.style)
 
+    def write_svg(self, writer):
+        "Stream this shape to an SvgWriter, writing path data straight from coordinates"
+        attributes = streamed_svg_styles.get(self.style)
+        if attributes is None:
+            return writer.drawing_element(self.svg())
+
+        d = self.svg_path_data(precision=writer.precision, relative=writer.relative)
+        writer.begin_group()
+        writer.path(d, **attributes)
+        if self.label:
+            writer.text_on_path(
+                self.label,
+                12,
+                d,
+                start_offset=10,
+                line_offset=-1,
+                stroke="none",
+                fill="#000000",
+            )
+        writer.end_group()
+
     def svg_line(self, **kwargs):
+        draw = _draw()
+
         group = draw.Group()
         group.append(self.svg_line_only(**kwargs))
         if self.label:
@@ -496,16 +868,16 @@ class Shape:
         return group
 
     def svg_line_only(self, close=False, fill="none", stroke="black", **kwargs):
-        "Draw only the line as an svg <lines> element"
-        return draw.Lines(
-            *self.interleavedCoordinates(),
-            close=close,
-            fill=fill,
-            stroke=stroke,
-            **kwargs
+        "Draw only the line as an svg <path> element"
+        draw = _draw()
+
+        return draw.Path(
+            d=self.svg_path_data(close=close), fill=fill, stroke=stroke, **kwargs
         )
 
     def svg_dashed(self):
+        draw = _draw()
+
         g = draw.Group()
         line = self.svg_line_only(stroke_dasharray="3")
         if self.label:
@@ -515,6 +887,8 @@ class Shape:
 
     def svg_parallel_label(self):
         "Draw the label parallel to the line itself"
+        draw = _draw()
+
         return draw.Text(
             self.label,
             12,
@@ -526,11 +900,15 @@ class Shape:
         )
 
     def svg_side_label(self):
+        draw = _draw()
+
         x = self.right
         y = self.bottom
         return draw.Text(self.label, 12, x=x, y=y, stroke="none", fill="#000000")
 
     def svg_pointset(self):
+        draw = _draw()
+
         g = draw.Group()
         for point in self.points:
             g.append(point.svg())
@@ -539,6 +917,8 @@ class Shape:
         return g
 
     def svg_join_the_dots(self):
+        draw = _draw()
+
         g = draw.Group()
         for point in self.points:
             g.append(point.svg())
@@ -546,14 +926,40 @@ class Shape:
         return g
 
     def center_of_mass(self):
-        numberOfSamples = self.numberOfPoints * 2
-        interval = self.length / numberOfSamples
-        summed = Vector(0, 0)
-        n = 0.0
-        for w in np.arange(0, self.length, interval):
-            summed = summed + self.at(w).point
-            n += 1
-        return summed / n
+        "Centroid of the line itself (like a piece of wire), not the area it encloses"
+        lengths = self.segment_lengths()
+        total = lengths.sum()
+        if total == 0:
+            return self.first_point
+        # Each segment weighs as much as it is long, and balances at its midpoint
+        midpoints = (self._coordinates[:-1] + self._coordinates[1:]) / 2
+        x, y = (lengths @ midpoints / total).tolist()
+        return Vector(x, y)
+
+    def signed_area(self) -> float:
+        """Area enclosed by the shape (closing it if needed).
+
+        Positive when the points go anticlockwise.
+        """
+        x, y = self._coordinates.T
+        # Shoelace formula, wrapping around from the last point to the first
+        return float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2
+
+    def area(self) -> float:
+        "Area enclosed by the shape, closing it if needed"
+        return abs(self.signed_area())
+
+    def area_centroid(self):
+        "Centroid of the area enclosed by the shape, closing it if needed"
+        x, y = self._coordinates.T
+        next_x, next_y = np.roll(x, -1), np.roll(y, -1)
+        cross = x * next_y - next_x * y
+        area = cross.sum() / 2
+        if area == 0:
+            return self.center_of_mass()
+        cx = np.dot(x + next_x, cross) / (6 * area)
+        cy = np.dot(y + next_y, cross) / (6 * area)
+        return Vector(float(cx), float(cy))
 
     def midpoint(self):
         return self.center_of_mass()
@@ -566,6 +972,8 @@ class Shape:
         return Shape([Vector(x, self.top), Vector(x, self.bottom)], style="dashed")
 
     def svg_centered_label(self):
+        draw = _draw()
+
         labelPosition = self.center_of_mass()
         return draw.Text(
             self.label,
@@ -578,6 +986,8 @@ class Shape:
         )
 
     def svg_polygon(self):
+        draw = _draw()
+
         group = draw.Group()
         group.append(self.svg_line_only(fill="#E6E6FA66"))
         if self.label:
@@ -585,6 +995,8 @@ class Shape:
         return group
 
     def svg_notch(self):
+        draw = _draw()
+
         group = draw.Group()
         group.append(self.svg_line_only(stroke="none", fill="#000000"))
         if self.label:
@@ -592,6 +1004,8 @@ class Shape:
         return group
 
     def svg_all_guides(self):
+        draw = _draw()
+
         group = draw.Group()
         group.append(self.svg_line_only())
         for side in self.numbered_sides():
@@ -599,6 +1013,8 @@ class Shape:
         return group
 
     def svg_tape(self):
+        draw = _draw()
+
         g = draw.Group()
         g.append(self.svg_line_only())
         g.append(self.svg_start_notch())
@@ -622,6 +1038,8 @@ class Shape:
         return g
 
     def svg_arrow(self, **kwargs):
+        draw = _draw()
+
         g = draw.Group()
         arrow = draw.Marker(-1.0, -0.5, 0.9, 0.5, scale=8, orient="auto")
         arrow.append(
@@ -639,6 +1057,8 @@ class Shape:
         return self.svg_arrow(stroke_dasharray="3")
 
     def svg_perpendicular_notchthrough(self, at):
+        draw = _draw()
+
         position = self.at(at)
         normal = position.normal().unitVector() * 5
         P = position.point - normal
@@ -651,46 +1071,49 @@ class Shape:
     def svg_end_notch(self):
         return self.svg_perpendicular_notchthrough(self.length)
 
-    def svg_ruler(self, step=10):
-        group = draw.Group()
-        group.append(self.svg_line())
-        for w in np.arange(0, self.length, step):
-            m = self.at(w)
-            marker = m.normal().withLength(-3)
-            group.append(marker.svg())
-            textPath = marker.withLength(100).translate(
-                marker.vector.withLength(marker.length + 1)
-            )
+    def svg_ruler_markings(
+        self, group, step=10, font_size=12, fill="#000000", **kwargs
+    ):
+        "Add a tick mark and measurement label every `step` millimeters to an svg group"
+        draw = _draw()
+
+        along = self.points_along(np.arange(0, self.length, step))
+        # Ticks point away from the normal, labels run along the tick
+        tick_ends = along.points - 3 * along.normals
+        text_starts = along.points - 4 * along.normals
+        text_ends = text_starts - 100 * along.normals
+        for w, tick_start, tick_end, text_start, text_end in zip(
+            along.distances.tolist(),
+            along.points.tolist(),
+            tick_ends.tolist(),
+            text_starts.tolist(),
+            text_ends.tolist(),
+        ):
+            group.append(draw.Line(*tick_start, *tick_end, **kwargs))
             label = draw.Text(
                 "{:.0f}mm".format(w),
-                12,
+                font_size,
                 stroke="none",
-                fill="#000000",
-                path=textPath.svg(),
+                fill=fill,
+                path=draw.Line(*text_start, *text_end),
             )
             group.append(label)
         return group
 
+    def svg_ruler(self, step=10):
+        draw = _draw()
+
+        group = draw.Group()
+        group.append(self.svg_line())
+        return self.svg_ruler_markings(group, step)
+
     def svg_faint_ruler(self, step=10):
+        draw = _draw()
+
         color = "#999999"
         group = draw.Group()
         group.append(self.svg_line(stroke=color))
-        for w in np.arange(0, self.length, step):
-            m = self.at(w)
-            marker = m.normal().withLength(-3)
-            group.append(marker.svg(stroke=color))
-            textPath = marker.withLength(100).translate(
-                marker.vector.withLength(marker.length + 1)
-            )
-            label = draw.Text(
-                "{:.0f}mm".format(w),
-                6,
-                stroke="none",
-                fill=color,
-                path=textPath.svg(),
-            )
-            group.append(label)
-        return group
+        return self.svg_ruler_markings(group, step, 6, fill=color, stroke=color)
 
     def __str__(self):
         points = ["{}".format(point) for point in self.points]
@@ -700,35 +1123,38 @@ class Shape:
         return self.translate(Vector(amount, 0))
 
     def translate_in_place(self, translation_vector: Vector):
-        for point in self.points:
-            point.x += translation_vector.x
-            point.y += translation_vector.y
+        x, y = translation_vector.x, translation_vector.y
+        curves = {
+            index: curve.translated(x, y) for index, curve in self._curves.items()
+        }
+        self._set_coordinates(self._vertices + (x, y))
+        self._curves = curves
 
     def translate(self, t):
-        return Shape(
-            [point + t for point in self.points], label=self.label, style=self.style
-        )
+        shape = self.copy()
+        shape.translate_in_place(t)
+        return shape
 
     def move(self, x, y):
         return self.translate(Vector(x, y))
 
     def scale(self, scalefactor):
         return Shape(
-            [point * scalefactor for point in self.points],
+            self._coordinates * scalefactor,
             label=self.label,
             style=self.style,
         )
 
     def scale_vertically(self, scalefactor):
         return Shape(
-            [point.scale_vertically(scalefactor) for point in self.points],
+            self._coordinates * (1.0, scalefactor),
             label=self.label,
             style=self.style,
         )
 
     def scale_horizontally(self, scalefactor):
         return Shape(
-            [point.scale_horizontally(scalefactor) for point in self.points],
+            self._coordinates * (scalefactor, 1.0),
             label=self.label,
             style=self.style,
         )
@@ -739,12 +1165,21 @@ class Shape:
         )
 
     def flipped_horizontally(self, mirror_x: float):
-        return self.map_points(lambda p: Vector(mirror_x - (p.x - mirror_x), p.y))
+        return Shape(
+            self._coordinates * (-1.0, 1.0) + (2 * mirror_x, 0.0),
+            label=self.label,
+            style=self.style,
+        )
 
     def sliceAfter(self, start: int | float | Vector):
         startMeasurement = self.at(start)
         return Shape(
-            [startMeasurement.point, *self.points[startMeasurement.index + 1 :]]
+            np.concatenate(
+                [
+                    as_coordinates([startMeasurement.point]),
+                    self._coordinates[startMeasurement.index + 1 :],
+                ]
+            )
         )
 
     def slice(
@@ -759,53 +1194,74 @@ class Shape:
             swap = startMeasurement
             startMeasurement = endMeasurement
             endMeasurement = swap
-        middlePoints = self.points[
+        middle = self._coordinates[
             startMeasurement.index + 1 : endMeasurement.index + 1
         ]
-        return Shape([startMeasurement.point, *middlePoints, endMeasurement.point])
+        return Shape(
+            np.concatenate(
+                [
+                    as_coordinates([startMeasurement.point]),
+                    middle,
+                    as_coordinates([endMeasurement.point]),
+                ]
+            )
+        )
 
     def slice_by_index(self, start_index: int, end_index: int):
-        new_shape = Shape()
-        for point in self.points[start_index:end_index]:
-            new_shape.line_to(point)
-        return new_shape
+        return Shape(self._coordinates[start_index:end_index])
 
-    def allowance(self, allowance=25.4, label=None):
+    def allowance(self, allowance=25.4, label=None, parallel=None):
+        "Polygon between the shape and its parallel, which can be passed in if known"
         if label == None:
             label = "{:.1f}mm allowance".format(math.fabs(allowance))
-        sliced_section = self.copy()
-        parallel = sliced_section.parallel(allowance)
-        result = Shape([], label=label, style="polygon")
-        for point in sliced_section.points:
-            result.lineTo(point)
-        for point in parallel.reverse().points:
-            result.lineTo(point)
+        if parallel is None:
+            parallel = self.parallel(allowance)
+        result = Shape(
+            np.concatenate([self._coordinates, parallel._coordinates[::-1]]),
+            label=label,
+            style="polygon",
+        )
         result.close()
         return result
 
     def intersections(self):
-        for start, meeting, end in zip(self.points, self.points[1:], self.points[2:]):
+        points = self.points
+        for start, meeting, end in zip(points, points[1:], points[2:]):
             yield Intersection(start, meeting, end)
 
+    def turning_angles(self) -> np.ndarray:
+        """The angle the polyline turns through at every point, as an array.
+
+        The ends of an open polyline don't turn, so they are nan. For a closed
+        shape the first (and last) point turns from the last segment into the first.
+        This is calculated once until the points change.
+        """
+        if self._turning_angles is None:
+            d = np.diff(self._coordinates, axis=0)
+            segment_angles = np.arctan2(d[:, 1], d[:, 0])
+            turns = np.full(len(self._coordinates), np.nan)
+            turns[1:-1] = normalize_angles(segment_angles[1:] - segment_angles[:-1])
+            if len(segment_angles) > 1 and self.closed:
+                turns[0] = turns[-1] = normalize_angles(
+                    segment_angles[0] - segment_angles[-1]
+                )
+            turns.flags.writeable = False
+            self._turning_angles = turns
+        return self._turning_angles
+
     def angles(self):
         "Iterate all the three point angles"
-        return [intersection.angle for intersection in self.intersections()]
+        return self.turning_angles()[1:-1].tolist()
 
     def corner_indices(self, threshhold_angle=default_corner_threshold):
-        for i in range(1, len(self.points) - 1):
-            intersection = Intersection(
-                self.points[i - 1], self.points[i], self.points[i + 1]
-            )
-            if abs(intersection.angle) > threshhold_angle:
-                yield i
+        "Indices of the points (not the ends) which turn more than the threshhold"
+        turns = self.turning_angles()[1:-1]
+        return (np.flatnonzero(np.abs(turns) > threshhold_angle) + 1).tolist()
 
     def corners(self, threshholdAngle=math.radians(15)):
         "Find the corners that have an angle larger than the threshhold"
-        return [self.firstPoint()] + [
-            intersection.meeting
-            for intersection in self.intersections()
-            if abs(intersection.angle) > threshholdAngle
-        ]
+        indices = [0, *self.corner_indices(threshholdAngle)]
+        return vectors(self._coordinates[indices])
 
     def numbered_corners(self, threshholdAngle=math.radians(15)):
         corners = self.corners(threshholdAngle)
@@ -814,8 +1270,9 @@ class Shape:
             for corner, i in zip(corners, range(0, len(corners)))
         ]
 
-    def sides(self, threshholdAngle=math.radians(15)):
-        corner_indices = list(self.corner_indices(threshholdAngle))
+    def find_sides(self, threshholdAngle=math.radians(15)):
+        "Split the shape into sides at its corners"
+        corner_indices = self.corner_indices(threshholdAngle)
         sides = [
             self.slice_by_index(i, j + 1)
             for i, j in zip(corner_indices, corner_indices[1:])
@@ -830,6 +1287,18 @@ class Shape:
                 sides.append(self.slice_by_index(corner_indices[-1], corner_indices[1]))
         return sides
 
+    def side_table(self, threshholdAngle=math.radians(15)) -> "SideTable":
+        "The sides with their centroids, kept until the points change"
+        if threshholdAngle not in self._side_tables:
+            self._side_tables[threshholdAngle] = SideTable(
+                self.find_sides(threshholdAngle)
+            )
+        return self._side_tables[threshholdAngle]
+
+    def sides(self, threshholdAngle=math.radians(15)):
+        # Copies, so that changing a side doesn't change the cached table
+        return [side.copy() for side in self.side_table(threshholdAngle).sides]
+
     def numbered_sides(self, threshhold_angle=math.radians(15)):
         sides = self.sides(threshhold_angle)
         return [
@@ -838,21 +1307,20 @@ class Shape:
         ]
 
     def topmost_side(self):
-        sides = self.sides()
-        return competition(sides, lambda side: side.center_of_mass().y)
+        return self.side_table().best(self.side_table().centroids[:, 1])
 
     def bottommost_side(self):
-        return competition(self.sides(), lambda side: -side.center_of_mass().y)
+        return self.side_table().best(-self.side_table().centroids[:, 1])
 
     def rightmost_side(self):
-        return competition(self.sides(), lambda side: side.center_of_mass().x)
+        return self.side_table().best(self.side_table().centroids[:, 0])
 
     def leftmost_side(self):
-        return competition(self.sides(), lambda side: -side.center_of_mass().x)
+        return self.side_table().best(-self.side_table().centroids[:, 0])
 
     def topmost_sides(self, number_of_sides):
-        return multiwinner_competition(
-            self.sides(), lambda side: side.center_of_mass().y, number_of_sides
+        return self.side_table().lowest(
+            self.side_table().centroids[:, 1], number_of_sides
         )
 
     def angleBisectionPathThing(self, distance):
@@ -870,40 +1338,48 @@ class Shape:
 
         return Shape([first, *inbetween, last])
 
-    def parallel(self, distance):
-        # First point is drawn at a normal to the first segment
-        first = self.firstSegment().parallel(distance).start
-
-        # Same for the last point
-        last = self.lastSegment().parallel(distance).end
+    def parallel(self, distance, miter_limit=default_miter_limit):
+        "The shape offset sideways by distance, with mitered corners and no loops"
+        return Shape(offset_coordinates(self._coordinates, distance, miter_limit))
 
-        inbetween = [
-            intersection.parallel(distance).meeting
-            for intersection in self.intersections()
+    def parallels(self, distances, miter_limit=default_miter_limit) -> List["Shape"]:
+        "The shape offset by each of several distances, sharing the miters between them"
+        return [
+            Shape(offset)
+            for offset in offset_coordinates_many(
+                self._coordinates, distances, miter_limit
+            )
         ]
-        return Shape([first, *inbetween, last])
+
+    def segment_grid(self) -> SegmentGrid:
+        "Spatial index of the line segments, built when first needed"
+        if self._segment_grid is None:
+            self._segment_grid = SegmentGrid(
+                self._coordinates[:-1], self._coordinates[1:]
+            )
+        return self._segment_grid
+
+    def closest_many(self, points):
+        """Find the closest position on the polyline to many points at once.
+
+        Returns three arrays: the distance from each point to the polyline, the
+        index of the closest segment and how far along that segment it is.
+        """
+        points = as_coordinates(points)
+        if self.numberOfSegments < 1:
+            distances = np.hypot(*(points - self._coordinates[0]).T)
+            zeros = np.zeros(len(points))
+            return distances, zeros.astype(int), zeros
+        distances, indices, closest = self.segment_grid().closest_many(points)
+        dx, dy = (closest - self._coordinates[indices]).T
+        remainders = np.sqrt(dx * dx + dy * dy)
+        return distances, indices, remainders
 
     def closest(self, X: Vector) -> MeasurementAlongShape:
-        # TODO: This needs to be simplified a lot
-        Y = self.points[0]
-        winningDistance = distance(X, Y)
-        winningIndex = 0
-        remainder = 0
-        w = 0
-        sum = 0
-        i = 0
-        for segment in self.segments():
-            P = segment.closestPoint(X)
-            dist = distance(P, X)
-            if dist < winningDistance:
-                Y = P
-                winningDistance = dist
-                winningIndex = i
-                remainder = distance(segment.start, Y)
-                w = sum + remainder
-            i += 1
-            sum += segment.length
-        return self.MeasurementAlongShape(self, w, winningIndex, remainder)
+        _, indices, remainders = self.closest_many([X])
+        index, remainder = int(indices[0]), float(remainders[0])
+        w = float(self.cumulative_lengths()[index]) + remainder
+        return self.MeasurementAlongShape(self, w, index, remainder)
 
     def closestPoint(self, X) -> Vector:
         return self.closest(X).point
@@ -923,13 +1399,22 @@ class Shape:
         afterDart = self.slice(lengthAlong + width / 2)
         dartPoint = at.point + at.normal().unitVector() * depth
 
-        self.points = [*beforeDart.points, dartPoint, *afterDart.points]
+        self._set_coordinates(
+            np.concatenate(
+                [
+                    beforeDart._coordinates,
+                    as_coordinates([dartPoint]),
+                    afterDart._coordinates,
+                ]
+            )
+        )
         return self
 
     def interpolationCurves(self, curveSpeed=1):
         from src.geometry.bezier import BezierCurve
 
-        q, r, s = self.points[:3]
+        points = self.points
+        q, r, s = points[:3]
         qrs = Intersection(q, r, s)
         qrDist = distance(q, r)
         guide1 = q + (r - q).withLength(qrDist / 2 * curveSpeed)
@@ -937,8 +1422,8 @@ class Shape:
         yield BezierCurve(q, guide1, guide2, r)
 
         # Interpolate middle segments
-        for i in range(3, len(self.points)):
-            p, q, r, s = self.points[i - 3 : i + 1]
+        for i in range(3, len(points)):
+            p, q, r, s = points[i - 3 : i + 1]
             pqr = Intersection(p, q, r)
             qrs = Intersection(q, r, s)
             qrDist = distance(q, r)
@@ -946,48 +1431,102 @@ class Shape:
             guide2 = r + qrs.bisect().normal().withLength(qrDist / 2 * curveSpeed)
             yield BezierCurve(q, guide1, guide2, r)
 
-        p, q, r = self.points[-3:]
+        p, q, r = points[-3:]
         pqr = Intersection(p, q, r)
         qrDist = distance(q, r)
         guide1 = q - pqr.bisect().normal().withLength(qrDist / 2 * curveSpeed)
         guide2 = r + (q - r).withLength(qrDist / 2 * curveSpeed)
         yield BezierCurve(q, guide1, guide2, r)
 
-    def interpolate(self, curveSpeed=1, upres=20):
-        points = []
-        for curve in self.interpolationCurves(curveSpeed):
-            points += curve.points(upres)[:-1]
-        return Shape(points)
+    def interpolate(self, curveSpeed=1, upres=20, tolerance=None):
+        """Smooth curve through the points, made of one Bezier curve per segment.
+
+        Each curve gets upres points, unless a tolerance (in mm) is given, in
+        which case each gets only as many as it needs to stay that close.
+        """
+        curves = list(self.interpolationCurves(curveSpeed))
+        if tolerance is None:
+            ts = np.arange(upres) / (upres - 1)
+            return Shape(
+                np.concatenate([curve.coordinates(ts)[:-1] for curve in curves])
+            )
+        flattened = [curve.flatten(tolerance) for curve in curves]
+        return Shape(np.concatenate([f[:-1] for f in flattened] + [flattened[-1][-1:]]))
 
     def replace(self, replacementSection):
         before = self.slice(0, replacementSection.start())
         after = self.slice(replacementSection.end())
-        return Shape(before.points + replacementSection.points + after.points)
+        return Shape(
+            np.concatenate(
+                [
+                    before._coordinates,
+                    replacementSection._coordinates,
+                    after._coordinates,
+                ]
+            )
+        )
 
     def to_3D(self):
         from src.geometry.Shape3d import Shape3d
 
-        points = [vec3(point.x, point.y, 0) for point in self.points]
+        points = [vec3(x, y, 0) for x, y in self._coordinates.tolist()]
         return Shape3d(points, label=self.label, style=self.style)
 
     def collision_vectors(self):
-        vectors = [p.collision_vector() for p in self.points]
+        import collision
+
+        vectors = [collision.Vector(x, y) for x, y in self._coordinates.tolist()]
         if self.is_closed:
             return vectors[:-1]
         else:
             return vectors
 
     def collision_polygon(self):
+        import collision
+
         return collision.Concave_Poly(collision.Vector(0, 0), self.collision_vectors())
 
-    def point_is_inside(self, point: Vector):
-        collision_polygon = self.collision_polygon()
-        collision_vector = point.collision_point()
-        return collision.collide(collision_polygon, collision_vector)
-        try:
-            collision.collide(collision_polygon, collision_vector)
-        except Exception as e:
-            print(e, collision_polygon, collision_vector)
+    def polygon_edges(self):
+        "Start and end coordinates of every edge, as if the shape were a closed polygon"
+        if self._polygon_edges is None:
+            starts = self._coordinates
+            if self.closed:
+                starts = starts[:-1]
+            self._polygon_edges = (starts, np.roll(starts, -1, axis=0))
+        return self._polygon_edges
+
+    def points_are_inside(self, points, tolerance=global_tolerance) -> np.ndarray:
+        """Test which of many points are inside the shape, as a closed polygon.
+
+        Uses the even-odd crossing rule. Points within `tolerance` of an edge
+        count as inside.
+        """
+        points = as_coordinates(points)
+        starts, ends = self.polygon_edges()
+        inside = np.empty(len(points), dtype=bool)
+        # Work through the points in chunks so the point x edge arrays stay small
+        chunk = max(1, 2**16 // len(starts))
+        for i in range(0, len(points), chunk):
+            query = points[i : i + chunk, np.newaxis]
+            px, py = query[..., 0], query[..., 1]
+            x0, y0 = starts[:, 0], starts[:, 1]
+            x1, y1 = ends[:, 0], ends[:, 1]
+            # Edges which straddle the horizontal line through the point...
+            straddles = (y0 > py) != (y1 > py)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                crossing_x = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+            # ...and cross it to the right of the point
+            crossings = np.count_nonzero(straddles & (px < crossing_x), axis=1)
+
+            closest = closest_points_on_segments(query, starts, ends)
+            on_boundary = np.any(
+                np.hypot(*np.moveaxis(closest - query, -1, 0)) <= tolerance, axis=1
+            )
+            inside[i : i + chunk] = (crossings % 2 == 1) | on_boundary
+        return inside
+
+    def point_is_inside(self, point: Vector, tolerance=global_tolerance) -> bool:
+        return bool(self.points_are_inside([point], tolerance)[0])
 
 
 def arrow(*points, label=None):
@@ -1018,6 +1557,8 @@ def rectangle(x, y, width, height):
 
 
 if __name__ == "__main__":
+    draw = _draw()
+
     square = Shape(
         [Vector(1, 1), Vector(1, 100), Vector(100, 100), Vector(100, 1), Vector(1, 1)]
     )
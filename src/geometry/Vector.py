@@ -1,8 +1,4 @@
 import math
-import collision
-
-import drawSvg as draw
-from multimethod import multimethod
 
 
 class Vector:
@@ -10,6 +6,9 @@ class Vector:
     y: float
     label: str | None
 
+    # Drafting makes a great many points, so keep each one small
+    __slots__ = ("x", "y", "label")
+
     def __init__(self, x, y, label=None):
         self.x = x
         self.y = y
@@ -39,7 +38,8 @@ class Vector:
         return "({}, {})".format(self.x, self.y)
 
     def __truediv__(self, divisor: float) -> "Vector":
-        return self * (1 / divisor)
+        scale = 1 / divisor
+        return Vector(self.x * scale, self.y * scale)
 
     @property
     def angle(self) -> float:
@@ -62,7 +62,8 @@ class Vector:
         self.y *= scale
 
     def unitVector(self):
-        return self / self.length
+        scale = 1 / math.sqrt(self.x * self.x + self.y * self.y)
+        return Vector(self.x * scale, self.y * scale)
 
     @property
     def direction(self):
@@ -76,9 +77,8 @@ class Vector:
 
     def with_angle(self, angle):
         "Make a new vector with the same length but different angle"
-        new = self.copy()
-        new.angle = angle
-        return new
+        m = math.sqrt(self.x * self.x + self.y * self.y)
+        return Vector(math.cos(angle) * m, math.sin(angle) * m)
 
     def withAngle(self, angle):
         "deprecated alias to with_angle"
@@ -86,15 +86,18 @@ class Vector:
 
     def withLength(self, length):
         "Make a new vector with the same angle but different length"
-        new = self.copy()
-        new.length = length
-        return new
+        scale = length / math.sqrt(self.x * self.x + self.y * self.y)
+        return Vector(self.x * scale, self.y * scale)
 
     def rotate(self, rotation):
-        return self.withAngle(self.angle + rotation)
+        "Make a new vector turned anticlockwise by rotation"
+        c, s = math.cos(rotation), math.sin(rotation)
+        return Vector(self.x * c - self.y * s, self.x * s + self.y * c)
 
     def extend(self, extension):
-        return self.withLength(self.length + extension)
+        m = math.sqrt(self.x * self.x + self.y * self.y)
+        scale = (m + extension) / m
+        return Vector(self.x * scale, self.y * scale)
 
     def normal(self):
         "Get a vector perpendicular to this one"
@@ -117,42 +120,42 @@ class Vector:
     def right(self):
         return self.x
 
+    # Each square method goes a distance, or across until level with a point
+
     def squareDown(self, amount):
         if isinstance(amount, Vector):
-            return self.squareDownToPoint(amount)
-        return self + Vector(0, -amount)
+            return Vector(self.x, amount.y)
+        return Vector(self.x, self.y - amount)
 
     def squareDownToPoint(self, point: "Vector"):
         return Vector(self.x, point.y)
 
-    @multimethod
-    def squareUp(self, amount: float):
-        return self + Vector(0, amount)
+    def squareUp(self, amount):
+        if isinstance(amount, Vector):
+            return Vector(self.x, amount.y)
+        return Vector(self.x, self.y + amount)
 
-    @squareUp.register
     def squareUpToPoint(self, point: "Vector"):
         return Vector(self.x, point.y)
 
-    @multimethod
-    def squareRight(self, amount: float):
-        return self + Vector(amount, 0)
+    def squareRight(self, amount):
+        if isinstance(amount, Vector):
+            return Vector(amount.x, self.y)
+        return Vector(self.x + amount, self.y)
 
-    @squareRight.register
     def squareRightToPoint(self, point: "Vector"):
         return Vector(point.x, self.y)
 
-    @multimethod
-    def squareLeft(self, amount: float):
-        return self + Vector(-amount, 0)
+    def squareLeft(self, amount):
+        if isinstance(amount, Vector):
+            return Vector(amount.x, self.y)
+        return Vector(self.x - amount, self.y)
 
-    @squareLeft.register
     def squareLeftToPoint(self, point: "Vector"):
         return Vector(point.x, self.y)
 
     def move(self, x, y):
-        new = Vector(self.x + x, self.y + y)
-        new.label = self.label
-        return new
+        return Vector(self.x + x, self.y + y, self.label)
 
     def moveLeft(self, amount: float):
         return self.move(-amount, 0)
@@ -171,6 +174,8 @@ class Vector:
         return self.label
 
     def svg(self):
+        import drawSvg as draw
+
         group = draw.Group()
         circle = draw.Circle(self.x, self.y, 1, fill="black")
         group.append(circle)
@@ -185,9 +190,13 @@ class Vector:
         return group
 
     def collision_vector(self):
+        import collision
+
         return collision.Vector(self.x, self.y)
 
     def collision_point(self):
+        import collision
+
         return collision.Circle(self.collision_vector(), 0.0)
 
     @property
@@ -210,4 +219,5 @@ def distance(a: Vector, b: Vector):
 
 
 def polar(angle, length):
-    return Vector(length, 0).with_angle(angle)
+    m = abs(length)
+    return Vector(math.cos(angle) * m, math.sin(angle) * m)
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 
 def normalizeAngle(angle: float):
     while angle > math.pi:
@@ -28,3 +30,17 @@ def shortest_turn(a: float, b: float):
     else:
         return anticlockwise
 
+
+def normalize_angles(angles: np.ndarray) -> np.ndarray:
+    "Array version of normalizeAngle, wraps every angle into -pi to pi"
+    angles = np.asarray(angles, dtype=np.float64)
+    wrapped = np.mod(angles + math.pi, 2 * math.pi) - math.pi
+    # normalizeAngle leaves positive odd multiples of pi at +pi
+    return np.where((wrapped == -math.pi) & (angles > 0), math.pi, wrapped)
+
+
+def shortest_turns(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    "Array version of shortest_turn"
+    clockwise = np.mod(np.subtract(b, a), 2 * math.pi)
+    anticlockwise = np.mod(np.subtract(a, b), 2 * math.pi)
+    return np.where(clockwise < anticlockwise, clockwise, anticlockwise)
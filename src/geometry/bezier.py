@@ -1,6 +1,12 @@
+import math
+
+import numpy as np
+
+from src.constants import default_flattening_tolerance
 from src.geometry.Group import Group
-from src.geometry.Shape import Shape, dashed
+from src.geometry.Shape import Shape, dashed, vectors
 from src.geometry.Vector import Vector
+from src.svg_writer import format_numbers
 
 
 class BezierCurve:
@@ -19,11 +25,59 @@ class BezierCurve:
             + self.p3 * pow(t, 3.0)
         )
 
+    def control_coordinates(self) -> np.ndarray:
+        "The four control points as a (4, 2) array"
+        return np.array(
+            [(p.x, p.y) for p in (self.p0, self.p1, self.p2, self.p3)], dtype=np.float64
+        )
+
+    def coordinates(self, ts) -> np.ndarray:
+        "The curve evaluated at every t in an array, as an (N, 2) array"
+        p0, p1, p2, p3 = self.control_coordinates()
+        t = np.asarray(ts, dtype=np.float64)[:, np.newaxis]
+        return (
+            p0 * (1.0 - t) ** 3.0
+            + p1 * 3 * (1 - t) ** 2 * t
+            + p2 * 3 * (1 - t) * t * t
+            + p3 * t**3.0
+        )
+
     def points(self, numberOfPoints):
-        return [self.B(t / (numberOfPoints - 1)) for t in range(0, numberOfPoints)]
+        return vectors(
+            self.coordinates(np.arange(numberOfPoints) / (numberOfPoints - 1))
+        )
+
+    def segments_for_tolerance(self, tolerance=default_flattening_tolerance) -> int:
+        """How many equal steps in t keep every chord within tolerance of the curve.
+
+        The chord error of a step is at most an eighth of the step squared times
+        the largest second derivative, which for a cubic is bounded by six times
+        the larger of its two control point second differences.
+        """
+        p0, p1, p2, p3 = self.control_coordinates()
+        bend = max(np.hypot(*(p0 - 2 * p1 + p2)), np.hypot(*(p1 - 2 * p2 + p3)))
+        return max(1, math.ceil(math.sqrt(0.75 * bend / tolerance)))
+
+    def flatten(self, tolerance=default_flattening_tolerance) -> np.ndarray:
+        "Just enough points along the curve that it is never more than tolerance away"
+        segments = self.segments_for_tolerance(tolerance)
+        return self.coordinates(np.arange(segments + 1) / segments)
+
+    def svg_path_command(self, precision=None) -> str:
+        "The svg `C` command which draws this curve on from its start point"
+        # svg has the y axis pointing downwards
+        flipped = self.control_coordinates()[1:] * (1.0, -1.0)
+        return "C{},{} {},{} {},{}".format(*format_numbers(flipped, precision))
+
+    def translated(self, x: float, y: float) -> "BezierCurve":
+        "The same curve, moved x to the right and y up"
+        t = Vector(x, y)
+        return BezierCurve(self.p0 + t, self.p1 + t, self.p2 + t, self.p3 + t)
 
-    def shape(self, numberOfPoints):
-        return Shape(self.points(numberOfPoints))
+    def shape(self, numberOfPoints=None, tolerance=default_flattening_tolerance):
+        if numberOfPoints is None:
+            return Shape(self.flatten(tolerance))
+        return Shape(self.coordinates(np.arange(numberOfPoints) / (numberOfPoints - 1)))
 
     def demo(self):
         return Group(
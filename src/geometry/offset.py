@@ -0,0 +1,125 @@
+import numpy as np
+
+# Miters longer than this many times the offset distance are cut short
+default_miter_limit = 10.0
+
+# How many segments either side of a loop to search for where it crosses itself
+loop_search_window = 16
+
+
+def unit_normals(coordinates: np.ndarray) -> np.ndarray:
+    "Left hand unit normal of each segment of a polyline"
+    steps = np.diff(coordinates, axis=0)
+    lengths = np.sqrt(steps[:, 0] * steps[:, 0] + steps[:, 1] * steps[:, 1])
+    lengths[lengths == 0] = 1.0
+    return np.stack([-steps[:, 1], steps[:, 0]], axis=1) / lengths[:, np.newaxis]
+
+
+def miter_vectors(
+    coordinates: np.ndarray, miter_limit=default_miter_limit
+) -> np.ndarray:
+    """How far each vertex of a polyline moves per unit of offset distance.
+
+    The ends move along the normal of their segment. Every vertex inbetween
+    moves along the bisector of its two segments, far enough that both offset
+    segments meet there, but never more than miter_limit.
+    """
+    normals = unit_normals(coordinates)
+    miters = np.empty((len(coordinates), 2))
+    miters[0] = normals[0]
+    miters[-1] = normals[-1]
+
+    incoming, outgoing = normals[:-1], normals[1:]
+    bisectors = incoming + outgoing
+    bisector_lengths = np.hypot(bisectors[:, 0], bisectors[:, 1])
+
+    # Where the polyline doubles back on itself the bisector points straight ahead
+    reversed = bisector_lengths < 1e-12
+    tangents = np.stack([incoming[:, 1], -incoming[:, 0]], axis=1)
+    bisectors[reversed] = tangents[reversed]
+    bisector_lengths[reversed] = 1.0
+    bisectors /= bisector_lengths[:, np.newaxis]
+
+    # Cosine of half the turn; collinear vertices give exactly one
+    cosines = np.sum(bisectors * incoming, axis=1)
+    scale = 1.0 / np.maximum(cosines, 1.0 / miter_limit)
+    miters[1:-1] = bisectors * scale[:, np.newaxis]
+    return miters
+
+
+def segment_intersections(p: np.ndarray, r: np.ndarray, q: np.ndarray, s: np.ndarray):
+    "Where segments p to p+r cross segments q to q+s (broadcast), and whether they do"
+    denominator = r[..., 0] * s[..., 1] - r[..., 1] * s[..., 0]
+    parallel = denominator == 0
+    denominator = np.where(parallel, 1.0, denominator)
+    qp = q - p
+    t = (qp[..., 0] * s[..., 1] - qp[..., 1] * s[..., 0]) / denominator
+    u = (qp[..., 0] * r[..., 1] - qp[..., 1] * r[..., 0]) / denominator
+    crossing = ~parallel & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+    return p + t[..., np.newaxis] * r, crossing
+
+
+def remove_loops(offset: np.ndarray, original: np.ndarray) -> np.ndarray:
+    """Cut out the small loops an offset makes where it is tighter than the distance.
+
+    Segments of the offset which run backwards compared to the original are
+    inside a loop. Around each run of them, the closest pair of segments which
+    cross are joined at their crossing and everything between is dropped.
+    """
+    offset_steps = np.diff(offset, axis=0)
+    backwards = np.sum(offset_steps * np.diff(original, axis=0), axis=1) < 0
+    if not backwards.any():
+        return offset
+
+    # First and last segment index of each run of backwards segments
+    edges = np.diff(np.concatenate([[0], backwards.astype(np.int8), [0]]))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1) - 1
+
+    keep = np.ones(len(offset), dtype=bool)
+    replacements = {}
+    last_dropped = -1
+    for a, b in zip(run_starts.tolist(), run_ends.tolist()):
+        before = np.arange(a - 1, max(a - 1 - loop_search_window, -1), -1)
+        after = np.arange(b + 1, min(b + 1 + loop_search_window, len(offset_steps)))
+        before = before[before > last_dropped]
+        if len(before) == 0 or len(after) == 0:
+            continue
+        i, j = before[:, np.newaxis], after[np.newaxis, :]
+        points, crossing = segment_intersections(
+            offset[i], offset_steps[i], offset[j], offset_steps[j]
+        )
+        if not crossing.any():
+            continue
+        # The smallest loop is the one spanning the fewest segments
+        spans = np.where(crossing, j - i, np.iinfo(int).max)
+        row, column = np.unravel_index(np.argmin(spans), spans.shape)
+        first, last = int(before[row]), int(after[column])
+        keep[first + 1 : last + 1] = False
+        replacements[first + 1] = points[row, column]
+        last_dropped = last
+
+    result = offset.copy()
+    for index, point in replacements.items():
+        result[index] = point
+        keep[index] = True
+    return result[keep]
+
+
+def offset_coordinates(
+    coordinates: np.ndarray, distance: float, miter_limit=default_miter_limit
+) -> np.ndarray:
+    "Offset a polyline sideways by distance (positive is to the left), without loops"
+    offset = coordinates + miter_vectors(coordinates, miter_limit) * distance
+    return remove_loops(offset, coordinates)
+
+
+def offset_coordinates_many(
+    coordinates: np.ndarray, distances, miter_limit=default_miter_limit
+) -> list[np.ndarray]:
+    "Offset a polyline by several distances, finding the miters only once"
+    miters = miter_vectors(coordinates, miter_limit)
+    return [
+        remove_loops(coordinates + miters * distance, coordinates)
+        for distance in distances
+    ]
@@ -4,10 +4,11 @@ from src.geometry.Group import Group
 
 def seam_lines(a: Shape, b: Shape, interval=30): 
     g = Group()
-    for w in np.arange(0, min(a.length, b.length), interval):
-        p = a.point_along(w)
-        q = b.point_along(w)
-        line = Shape([p, q], style="dashed")
+    ws = np.arange(0, min(a.length, b.length), interval)
+    # Each row is the start and end of one seam line
+    pairs = np.stack([a.points_along(ws).points, b.points_along(ws).points], axis=1)
+    for pair in pairs:
+        line = Shape(pair, style="dashed")
         g.append(line)
     return g
 
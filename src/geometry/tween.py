@@ -3,45 +3,69 @@ from src.geometry.Group import Group
 from src.geometry.Vector import Vector
 from src.geometry.Shape import Shape
 import numpy as np
-from src.geometry.Vector import Vector, polar
 
-from src.geometry.angles import shortest_turn
+from src.geometry.angles import normalize_angles, shortest_turns
 
-def pointwise_tween(a: Shape, b: Shape, phase: float, resolution = 1.0) -> Shape:
+
+def resample_pair(a: Shape, b: Shape, ws: np.ndarray):
+    "Sample two shapes at the same fractions (0 to 1) of their lengths"
+    p = a.points_along(ws * a.length).points
+    q = b.points_along(ws * b.length).points
+    return p, q
+
+
+def pointwise_tween_coordinates(
+    a: Shape, b: Shape, phases, resolution=1.0
+) -> np.ndarray:
+    "Pointwise tween for many phases at once, as a (phases, N, 2) array"
     larger_length = max(a.length, b.length)
+    p, q = resample_pair(a, b, np.arange(0, 1, resolution / larger_length))
+    phases = np.asarray(phases, dtype=np.float64).reshape(-1, 1, 1)
+    return p + (q - p) * phases
+
 
-    shape = Shape()
-    for w in np.arange(0, 1, resolution / larger_length):
-        p = a.pointAlong(w * a.length)
-        q = b.pointAlong(w * b.length)
-        r = p + (q-p) * phase
-        shape.line_to(r)
-    return shape
+def pointwise_tween(a: Shape, b: Shape, phase: float, resolution=1.0) -> Shape:
+    return Shape(pointwise_tween_coordinates(a, b, [phase], resolution)[0])
 
 
-def tween(a: Shape, b: Shape, phase: float, resolution = 1.0) -> Shape:
+def tween_coordinates(a: Shape, b: Shape, phases, resolution=1.0) -> np.ndarray:
+    """Tween between two shapes for many phases at once.
+
+    Both shapes are resampled once onto a shared grid of fractions along their
+    length. Each phase then blends the angle and length of every step between
+    samples. Returns a (phases, N, 2) array of coordinates.
+    """
     larger_length = max(a.length, b.length)
     step = resolution / larger_length
+    p, q = resample_pair(a, b, np.arange(step, 1.0, step))
+
+    phases = np.asarray(phases, dtype=np.float64).reshape(-1, 1)
+    vP = np.diff(p, axis=0)
+    vQ = np.diff(q, axis=0)
+    angle_p = np.arctan2(vP[:, 1], vP[:, 0])
+    angle_q = np.arctan2(vQ[:, 1], vQ[:, 0])
+    length_p = np.hypot(vP[:, 0], vP[:, 1])
+    length_q = np.hypot(vQ[:, 0], vQ[:, 1])
+
+    # One row per phase, one column per step
+    turn = normalize_angles(angle_p + shortest_turns(angle_q, angle_p) * phases)
+    length = length_p * (1.0 - phases) + phases * length_q
+    steps = np.stack([np.cos(turn) * length, np.sin(turn) * length], axis=-1)
+
+    start = a.coordinates[0] * (1.0 - phases) + b.coordinates[0] * phases
+    coordinates = np.empty((len(phases), len(vP) + 1, 2))
+    coordinates[:, 0] = start
+    coordinates[:, 1:] = start[:, np.newaxis] + np.cumsum(steps, axis=1)
+    return coordinates
 
-    shape = Shape()
-    shape.start_at(a.first_point * (1.0-phase) + b.first_point * phase)
 
-    last_p = None
-    last_q = None
-    for w in np.arange(step, 1.0, step):
-        p = a.pointAlong(w * a.length)
-        q = b.pointAlong(w * b.length)
-        if last_p:
-            vP = p - last_p
-            vQ = q - last_q
-            turn = vP.angle + shortest_turn(vQ.angle, vP.angle) * phase
-            length = vP.length * (1.0-phase) + phase * vQ.length
-            shape.append(shape.last_point + polar(turn, length))
-        last_p = p
-        last_q = q
+def tweens(a: Shape, b: Shape, phases, resolution=1.0) -> list[Shape]:
+    "Tween between two shapes for many phases at once"
+    return [Shape(c) for c in tween_coordinates(a, b, phases, resolution)]
 
 
-    return shape
+def tween(a: Shape, b: Shape, phase: float, resolution=1.0) -> Shape:
+    return tweens(a, b, [phase], resolution)[0]
 
 
 
@@ -50,8 +74,11 @@ def tween_demo(a: Shape, b:Shape):
     step = .05
     shapes = []
     shapes.append(a.with_label("A").with_style("arrow"))
-    for phase in np.arange(step, 1.0, step):
-        shapes.append(tween(a, b, phase).with_label("{:.0f}%".format(phase*100)).with_style("arrow"))
+    phases = np.arange(step, 1.0, step)
+    for phase, shape in zip(phases, tweens(a, b, phases)):
+        shapes.append(
+            shape.with_label("{:.0f}%".format(phase * 100)).with_style("arrow")
+        )
 
     shapes.append(b.with_label("B").with_style("arrow"))
 
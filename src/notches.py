@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.geometry.Shape import Shape
 from src.geometry.Vector import Vector, polar
 
@@ -8,27 +10,46 @@ class Notch:
         self.angle = angle
         self.length = length
         self.width = width
+        self._shape = None
+        self._shape_key = None
 
     def direction(self):
         return polar(self.angle, 1)
 
+    def bounding_rect(self):
+        return self.shape().bounding_rect()
+
     @property
     def top(self):
-        return self.shape().top
+        return self.bounding_rect().top
 
     @property
     def bottom(self):
-        return self.shape().bottom
+        return self.bounding_rect().bottom
 
     @property
     def left(self):
-        return self.shape().left
+        return self.bounding_rect().left
 
     @property
     def right(self):
-        return self.shape().right
+        return self.bounding_rect().right
 
     def shape(self):
+        "The notch as a Shape, only rebuilt when the notch is changed"
+        key = (
+            self.position.x,
+            self.position.y,
+            self.angle,
+            self.length,
+            self.width,
+        )
+        if self._shape_key != key:
+            self._shape = self.make_shape()
+            self._shape_key = key
+        return self._shape
+
+    def make_shape(self):
         end = self.position
         start = self.position + self.direction() * self.length
         direction = self.direction()
@@ -48,5 +69,19 @@ class Notch:
 
 
 def notch_on_shape(shape: Shape, where: float | int | Vector, length=10.0, width=3.0):
-    at = shape.at(where)
-    return Notch(position=at.point, angle=at.normal().angle, length=length, width=width)
+    if isinstance(where, Vector):
+        at = shape.at(where)
+        return Notch(
+            position=at.point, angle=at.normal().angle, length=length, width=width
+        )
+    return notches_on_shape(shape, [where], length=length, width=width)[0]
+
+
+def notches_on_shape(shape: Shape, positions: list[float], length=10.0, width=3.0):
+    "Make a notch at each of many distances along a shape in one go"
+    along = shape.points_along(positions)
+    angles = np.arctan2(along.normals[:, 1], along.normals[:, 0])
+    return [
+        Notch(position=Vector(x, y), angle=angle, length=length, width=width)
+        for (x, y), angle in zip(along.points.tolist(), angles.tolist())
+    ]
@@ -0,0 +1,296 @@
+"""Saving drafted patterns to a compact binary file, and loading them lazily.
+
+The file holds:
+
+    magic        8 bytes, b"SEWPAT01"
+    header size  little endian uint64
+    header       utf-8 json: style and label tables, curves, notches and the group tree,
+                 padded with spaces to a multiple of 8 bytes
+    items        int64 (N, 5): kind, first row, row count, style index, label index
+    coordinates  float64 (M, 2): the points of every item, one after another
+
+Items and coordinates are memory mapped when loading, so opening even a very
+large pattern only reads the header. Each piece is read when it's accessed.
+"""
+
+import io
+import json
+from collections.abc import MutableMapping
+
+import numpy as np
+
+from src.geometry.Group import Group
+from src.geometry.Shape import Shape
+from src.geometry.Vector import Vector
+from src.notches import Notch
+
+magic = b"SEWPAT01"
+file_version = 1
+
+# Kinds of item
+shape_item = 0
+point_item = 1
+notch_item = 2
+
+item_columns = 5
+
+
+def curve_record(index: int, curve) -> list:
+    "A curve of a shape as plain json, starting from vertex index"
+    from src.geometry.Arc import Arc
+    from src.geometry.bezier import BezierCurve
+
+    if isinstance(curve, BezierCurve):
+        return [index, "bezier", curve.control_coordinates().ravel().tolist()]
+    if isinstance(curve, Arc):
+        c = curve
+        return [
+            index,
+            "arc",
+            [c.center.x, c.center.y, c.radius, c.startAngle, c.endAngle],
+        ]
+    raise ValueError("Can't save curve:", curve)
+
+
+def curve_from_record(record):
+    from src.geometry.Arc import Arc
+    from src.geometry.bezier import BezierCurve
+
+    index, kind, numbers = record
+    if kind == "bezier":
+        return index, BezierCurve(
+            *[Vector(x, y) for x, y in zip(numbers[::2], numbers[1::2])]
+        )
+    if kind == "arc":
+        x, y, radius, startAngle, endAngle = numbers
+        return index, Arc(Vector(x, y), radius, startAngle, endAngle)
+    raise ValueError("Unknown curve in pattern file:", kind)
+
+
+class PatternWriter:
+    "Collects the items and tables of a pattern before it is saved"
+
+    def __init__(self):
+        self.items = []
+        self.coordinates = []
+        self.rows = 0
+        self.styles = {}
+        self.labels = {}
+        self.curves = {}
+        self.notches = {}
+
+    def table_index(self, table: dict, value) -> int:
+        if value is None:
+            return -1
+        return table.setdefault(value, len(table))
+
+    def add_item(self, kind: int, coordinates: np.ndarray, style, label) -> int:
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        self.items.append(
+            (
+                kind,
+                self.rows,
+                len(coordinates),
+                self.table_index(self.styles, style),
+                self.table_index(self.labels, label),
+            )
+        )
+        self.coordinates.append(coordinates)
+        self.rows += len(coordinates)
+        return len(self.items) - 1
+
+    def add(self, object):
+        "Add an object, returning its item index, or the tree of a group"
+        if isinstance(object, Shape):
+            index = self.add_item(
+                shape_item, object._vertices, object.style, object.label
+            )
+            if object._curves:
+                self.curves[str(index)] = [
+                    curve_record(i, object._curves[i]) for i in sorted(object._curves)
+                ]
+            return index
+        if isinstance(object, Vector):
+            return self.add_item(point_item, [(object.x, object.y)], None, object.label)
+        if isinstance(object, Notch):
+            position = object.position
+            index = self.add_item(notch_item, [(position.x, position.y)], None, None)
+            self.notches[str(index)] = [object.angle, object.length, object.width]
+            return index
+        if isinstance(object, Group):
+            return {
+                "label": object.label,
+                "objects": [[key, self.add(object[key])] for key in object.objects],
+            }
+        raise ValueError("Can't save object in a pattern file:", object)
+
+    def header(self, root) -> bytes:
+        header = json.dumps(
+            {
+                "version": file_version,
+                "items": len(self.items),
+                "rows": self.rows,
+                "styles": list(self.styles),
+                "labels": list(self.labels),
+                "curves": self.curves,
+                "notches": self.notches,
+                "root": root,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        # Keep the arrays after it aligned for memory mapping
+        return header + b" " * (-len(header) % 8)
+
+    def write(self, f, root):
+        header = self.header(root)
+        f.write(magic)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        f.write(np.array(self.items, dtype="<i8").reshape(-1, item_columns).tobytes())
+        for coordinates in self.coordinates:
+            f.write(coordinates.astype("<f8").tobytes())
+
+
+def save_pattern(filename: str, object):
+    "Save a Group (or a single Shape or Vector) to a pattern file"
+    writer = PatternWriter()
+    root = writer.add(object)
+    with open(filename, "wb") as f:
+        writer.write(f, root)
+
+
+def pattern_bytes(object) -> bytes:
+    "The contents of a pattern file for object, without writing it anywhere"
+    writer = PatternWriter()
+    root = writer.add(object)
+    output = io.BytesIO()
+    writer.write(output, root)
+    return output.getvalue()
+
+
+class PatternFile:
+    """An open pattern file, with its arrays memory mapped.
+
+    Nothing is read from the arrays until an item is asked for. The contents
+    can also be given as bytes in memory, as made by pattern_bytes().
+    """
+
+    def __init__(self, filename: str = None, data: bytes = None):
+        self.filename = filename
+        self.data = data
+        f = open(filename, "rb") if data is None else io.BytesIO(data)
+        with f:
+            if f.read(len(magic)) != magic:
+                raise ValueError("Not a pattern file:", filename)
+            header_size = int.from_bytes(f.read(8), "little")
+            header = f.read(header_size)
+        header = json.loads(header.decode("utf-8"))
+        if header["version"] > file_version:
+            raise ValueError("Pattern file is from a newer version:", header["version"])
+        self.styles = header["styles"]
+        self.labels = header["labels"]
+        self.curves = header["curves"]
+        self.notches = header.get("notches", {})
+        self.root = header["root"]
+
+        offset = len(magic) + 8 + header_size
+        item_count, rows = header["items"], header["rows"]
+        self.items = self.memory_map("<i8", offset, (item_count, item_columns))
+        offset += item_count * item_columns * 8
+        self.coordinates = self.memory_map("<f8", offset, (rows, 2))
+
+    def memory_map(self, dtype, offset: int, shape) -> np.ndarray:
+        if self.data is not None:
+            count = shape[0] * shape[1]
+            return np.frombuffer(
+                self.data, dtype=dtype, count=count, offset=offset
+            ).reshape(shape)
+        if shape[0] == 0:
+            # mmap can't map nothing
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(
+            self.filename, dtype=dtype, mode="r", offset=offset, shape=shape
+        )
+
+    def __len__(self):
+        return len(self.items)
+
+    def item(self, index: int):
+        "Read item index from the file as a new Shape or Vector"
+        kind, start, count, style, label = self.items[index].tolist()
+        label = self.labels[label] if label >= 0 else None
+        # Copy out of the file, so the shape can be changed
+        coordinates = np.array(
+            self.coordinates[start : start + count], dtype=np.float64
+        )
+        if kind == point_item:
+            x, y = coordinates[0].tolist()
+            return Vector(x, y, label=label)
+        if kind == notch_item:
+            x, y = coordinates[0].tolist()
+            return Notch(Vector(x, y), *self.notches[str(index)])
+        shape = Shape(label=label, style=self.styles[style] if style >= 0 else "line")
+        shape._set_coordinates(coordinates)
+        for record in self.curves.get(str(index), []):
+            vertex, curve = curve_from_record(record)
+            shape._curves[vertex] = curve
+        return shape
+
+    def object(self, node):
+        "Item node, or a lazily loaded group if node is a group tree"
+        if isinstance(node, dict):
+            return self.group(node)
+        return self.item(node)
+
+    def group(self, node=None) -> Group:
+        "The group for a tree in the header (the whole pattern by default), read lazily"
+        if node is None:
+            node = self.root
+        group = Group()
+        group.label = node["label"]
+        group.objects = LazyObjects(self, node["objects"])
+        return group
+
+    def load(self):
+        "The whole pattern, as whatever was saved"
+        return self.object(self.root)
+
+
+class NotLoaded:
+    def __init__(self, node):
+        self.node = node
+
+
+class LazyObjects(MutableMapping):
+    "A group's objects, each read from the pattern file the first time it is used"
+
+    def __init__(self, file: PatternFile, objects):
+        self.file = file
+        self.objects = {key: NotLoaded(node) for key, node in objects}
+
+    def __getitem__(self, key):
+        object = self.objects[key]
+        if isinstance(object, NotLoaded):
+            object = self.objects[key] = self.file.object(object.node)
+        return object
+
+    def __setitem__(self, key, value):
+        self.objects[key] = value
+
+    def __delitem__(self, key):
+        del self.objects[key]
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __contains__(self, key):
+        return key in self.objects
+
+
+def load_pattern(filename: str):
+    "Open a pattern file; groups read each of their objects only when it's used"
+    return PatternFile(filename).load()
@@ -1,11 +1,22 @@
 import numpy as np
 from .geometry.Vector import Vector
-from .geometry.Shape import Shape
+from .geometry.Shape import Shape, vectors
 
 
 default_cell_width = 10.0
 
 
+def point_grid_coordinates(
+    left: float, top: float, width: float, height: float, cell_width=default_cell_width
+) -> np.ndarray:
+    "The same points as point_grid, as an (N, 2) array"
+    cell_height = cell_width
+    xs = np.arange(left, left + width, cell_width)
+    ys = np.arange(top, top - height, -cell_height)
+    x, y = np.meshgrid(xs, ys, indexing="ij")
+    return np.stack([x.ravel(), y.ravel()], axis=1)
+
+
 def point_grid(
     left: float, top: float, width: float, height: float, cell_width=default_cell_width
 ):
@@ -23,3 +34,15 @@ def point_grid_over_shape(shape: Shape, cell_width=default_cell_width, margin=0.
         height=shape.height + 2 * margin,
         cell_width=cell_width,
     )
+
+
+def point_grid_inside_shape(shape: Shape, cell_width=default_cell_width, margin=0.0):
+    "The points of point_grid_over_shape which are inside the shape, tested all at once"
+    grid = point_grid_coordinates(
+        left=shape.left - margin,
+        top=shape.top + margin,
+        width=shape.width + 2 * margin,
+        height=shape.height + 2 * margin,
+        cell_width=cell_width,
+    )
+    return vectors(grid[shape.points_are_inside(grid)])
@@ -5,6 +5,8 @@ import string
 from src.geometry.Rectangle import minimumBoundingRect
 from src.geometry.Shape import Shape
 from src.geometry.Vector import Vector
+from src.svg_cache import cached_svg
+from src.svg_writer import SvgWriter
 
 greek_aplhabet = [
     "α",
@@ -40,13 +42,52 @@ def n2a(n, b=greek_aplhabet):
     return n2a(d - 1, b) + b[m] if d else b[m]
 
 
-def render(*objects):
-    "Quickly render any number of objects as SVG"
+a4_width = 297
+a4_height = 210
+a4_grid_color = "#dddddd"
+grid_size = 50
+grid_color = "#ffcccc66"
+# Decimal places for coordinates in compact drawings, a hundredth of a millimetre
+compact_precision = 2
 
+
+def render_rects(objects):
+    "The bounds of the objects, and the bounds of the drawing with a margin around them"
     actual_rect = minimumBoundingRect(objects)
+    return actual_rect, actual_rect.enlarge(100)
+
+
+def a4_lines(rect):
+    "Start and end of every horizontal then vertical line between A4 sheets"
+    for y in np.arange(rect.bottom, rect.top, a4_height).tolist():
+        yield rect.left, y, rect.right, y
+    for x in np.arange(rect.left, rect.right, a4_width).tolist():
+        yield x, rect.bottom, x, rect.top
+
+
+def a4_labels(rect):
+    "Name and center of every A4 sheet"
+    xs = np.arange(rect.left + a4_width / 2, rect.right, a4_width).tolist()
+    ys = np.arange(rect.bottom + a4_height / 2, rect.top, a4_height).tolist()
+    for col, x in enumerate(xs):
+        for row, y in enumerate(ys):
+            yield "{}{}".format(n2a(col), row), x, y
+
 
-    # Add a margin
-    rect = actual_rect.enlarge(100)
+def grid_lines(rect, actual_rect):
+    "Each grid line's start and end, with its measurement label and where that goes"
+    for y in np.arange(rect.bottom, rect.top, grid_size).tolist():
+        label = "{:.0f}mm".format(y - actual_rect.bottom)
+        yield (rect.left, y, rect.right, y), label, rect.left + 1, y + 2
+    for x in np.arange(rect.left, rect.right, grid_size).tolist():
+        label = "{:.0f}mm".format(x - actual_rect.left)
+        yield (x, rect.bottom, x, rect.top), label, x + 2, rect.bottom + 1
+
+
+def render(*objects):
+    "Quickly render any number of objects as SVG"
+
+    actual_rect, rect = render_rects(objects)
 
     d = draw.Drawing(
         rect.width,
@@ -56,77 +97,92 @@ def render(*objects):
         fill="none",
     )
 
-    # Draw horizontal A4 lines
-    gridColor = "#dddddd"
-    for y in np.arange(rect.bottom, rect.top, 210):
-        d.append(
-            draw.Line(
-                rect.left,
-                y,
-                rect.right,
-                y,
-                stroke=gridColor,
-            )
-        )
+    # Draw A4 lines and labels
+    for line in a4_lines(rect):
+        d.append(draw.Line(*line, stroke=a4_grid_color))
+    for label, x, y in a4_labels(rect):
+        d.append(draw.Text(label, 10, x, y, stroke="none", fill=a4_grid_color))
 
-    # Draw vertical A4 lines
-    for x in np.arange(rect.left, rect.right, 297):
-        d.append(
-            draw.Line(
-                x,
-                rect.bottom,
-                x,
-                rect.top,
-                stroke=gridColor,
-            )
-        )
+    # Draw the measurement grid
+    for line, label, x, y in grid_lines(rect, actual_rect):
+        d.append(draw.Line(*line, stroke=grid_color, stroke_dasharray=5))
+        d.append(draw.Text(label, 8, x, y, stroke="none", fill=grid_color))
 
-    # Draw A4 labels
-    col = 0
-    for x in np.arange(rect.left + 297 / 2, rect.right, 297):
-        row = 0
-        for y in np.arange(rect.bottom + 210 / 2, rect.top, 210):
-            label = "{}{}".format(n2a(col), row)
-            d.append(draw.Text(label, 10, x, y, stroke="none", fill=gridColor))
-
-            row += 1
-        col += 1
-
-    gridSize = 50
-    gridColor = "#ffcccc66"
-    # Draw horizontal grid lines
-    for y in np.arange(rect.bottom, rect.top, gridSize):
-        d.append(
-            draw.Line(rect.left, y, rect.right, y, stroke=gridColor, stroke_dasharray=5)
-        )
-        d.append(
-            draw.Text(
-                "{:.0f}mm".format(y - actual_rect.bottom),
-                8,
-                rect.left + 1,
-                y + 2,
-                stroke="none",
-                fill=gridColor,
-            )
-        )
+    # With use_svg_cache(), anything drawn before with the same content comes from the
+    # svg cache
+    for object in objects:
+        d.append(cached_svg(object))
 
-    # Draw vertical A4 lines
-    for x in np.arange(rect.left, rect.right, gridSize):
-        d.append(
-            draw.Line(x, rect.bottom, x, rect.top, stroke=gridColor, stroke_dasharray=5)
-        )
-        d.append(
-            draw.Text(
-                "{:.0f}mm".format(x - actual_rect.left),
-                8,
-                x + 2,
-                rect.bottom + 1,
-                stroke="none",
-                fill=gridColor,
+    return d
+
+
+def render_to(
+    output, *objects, compact=False, precision=None, grid_pattern=False, cache=None
+):
+    """Write the same drawing as render() to a file name or text stream.
+
+    Each element is written as soon as it is made, rather than building the
+    whole drawing in memory first.
+
+    A compact drawing rounds coordinates to precision decimal places (two if
+    not given), writes paths with relative commands, and draws each grid as a
+    single path. With grid_pattern, the measurement grid is an svg pattern
+    fill rather than lines.
+
+    With a cache (an SvgCache, or True for the shared svg_cache) objects
+    written before are copied from it.
+    """
+    if isinstance(output, str):
+        with open(output, "w", encoding="utf-8") as f:
+            return render_to(
+                f,
+                *objects,
+                compact=compact,
+                precision=precision,
+                grid_pattern=grid_pattern,
+                cache=cache,
             )
+
+    if compact and precision is None:
+        precision = compact_precision
+
+    actual_rect, rect = render_rects(objects)
+    writer = SvgWriter(
+        output,
+        rect,
+        precision=precision,
+        relative=compact,
+        cache=cache,
+        stroke="black",
+        fill="none",
+    )
+
+    if compact:
+        writer.lines(a4_lines(rect), stroke=a4_grid_color)
+    else:
+        for line in a4_lines(rect):
+            writer.line(*line, stroke=a4_grid_color)
+    for label, x, y in a4_labels(rect):
+        writer.text(label, 10, x, y, stroke="none", fill=a4_grid_color)
+
+    grid = list(grid_lines(rect, actual_rect))
+    if grid_pattern:
+        writer.grid_pattern(
+            rect,
+            grid_size,
+            origin=(rect.left, rect.bottom),
+            stroke=grid_color,
+            stroke_dasharray=5,
         )
+    elif compact:
+        writer.lines([line for line, *_ in grid], stroke=grid_color, stroke_dasharray=5)
+    else:
+        for line, *_ in grid:
+            writer.line(*line, stroke=grid_color, stroke_dasharray=5)
+    for _, label, x, y in grid:
+        writer.text(label, 8, x, y, stroke="none", fill=grid_color)
 
     for object in objects:
-        d.append(object.svg())
+        writer.object(object)
 
-    return d
+    writer.close()
@@ -1,6 +1,6 @@
 from src.geometry.Shape import Shape
 from src.geometry.Group import Group
-from src.notches import notch_on_shape
+from src.notches import notches_on_shape
 from src.units import inch
 
 
@@ -13,14 +13,13 @@ def french_seam_allowance(
         # TODO: Use notches at regular intervals
         notch_positions = [50]
 
-    notches = Group()
-    for notch_position in notch_positions:
-        notch = notch_on_shape(a, notch_position, length=seam_allowance)
-        notches.append(notch)
+    notches = Group(*notches_on_shape(a, notch_positions, length=seam_allowance))
+
+    edge, fold = a.parallels([seam_allowance, fold_allowance])
 
     return Group(
-        allowance=a.allowance(seam_allowance),
-        fold=a.parallel(fold_allowance).with_style("dashed"),
+        allowance=a.allowance(seam_allowance, parallel=edge),
+        fold=fold.with_style("dashed"),
         notches=notches,
     )
 
@@ -1,6 +1,6 @@
 from numpy import mean
 
-from .women_size import measurement_to_size, size_to_measurement
+from .women_size import measurement_names, measurement_to_size, measurements_at_sizes
 
 
 class BodyMeasurements:
@@ -24,11 +24,10 @@ class BodyMeasurements:
             self.all[key] = kwargs[key]
             self.known[key] = kwargs[key]
 
-        # Add approximations
+        # Add approximations, looking up every measurement for the size at once
         self.approximations = {}
-        for key in size_to_measurement:
+        for key, y in zip(measurement_names, measurements_at_sizes(size).tolist()):
             if not key in self.known:
-                y = float(size_to_measurement[key](size))
                 self.all[key] = y
                 self.approximations[key] = y
 
@@ -42,10 +41,8 @@ class BodyMeasurements:
         return str
 
     def deviances(self):
-        return {
-            key: self.all[key] - size_to_measurement[key](self.size)
-            for key in size_to_measurement
-        }
+        standard = measurements_at_sizes(self.size).tolist()
+        return {key: self.all[key] - y for key, y in zip(measurement_names, standard)}
 
     @property
     def hip(self):
@@ -0,0 +1,125 @@
+import csv
+
+import numpy as np
+
+from .BodyMeasurements import BodyMeasurements
+from .women_size import (
+    least_squares_sizes,
+    mean_sizes,
+    measurement_index,
+    measurements_at_sizes,
+)
+
+
+class BodyMeasurementsBatch:
+    """Measurements of many bodies at once, one array per measurement.
+
+    Unknown measurements are nan. Sizes are estimated for every body together,
+    either like BodyMeasurements does (the mean of the size each measurement
+    suggests) or with a least squares fit of all the known measurements.
+    Each body can still be had as a BodyMeasurements.
+    """
+
+    def __init__(self, known: dict, sizes=None, method="mean", columns=None):
+        self.known = {
+            key: np.asarray(values, dtype=np.float64) for key, values in known.items()
+        }
+        # Any other columns, such as customer names, kept as they were read
+        self.columns = columns or {}
+        lengths = {len(values) for values in self.known.values()}
+        if sizes is not None:
+            lengths.add(len(sizes))
+        if len(lengths) > 1:
+            raise ValueError("Measurements for different numbers of bodies:", lengths)
+        self.count = lengths.pop() if lengths else 0
+
+        if sizes is None:
+            sizes = np.full(self.count, np.nan)
+        self.sizes = np.array(sizes, dtype=np.float64)
+        # Estimate any sizes which weren't given
+        missing = np.isnan(self.sizes)
+        if missing.any():
+            if method == "mean":
+                estimated = mean_sizes(self.known)
+            elif method == "least_squares":
+                estimated = least_squares_sizes(self.known)
+            else:
+                raise ValueError("Unknown method of estimating sizes:", method)
+            self.sizes[missing] = np.broadcast_to(estimated, self.sizes.shape)[missing]
+
+        # Every standard measurement for every body, with a row per measurement
+        self.standard = measurements_at_sizes(self.sizes).reshape(-1, self.count)
+        self.all = self.standard.copy()
+        self.known_mask = np.zeros(self.all.shape, dtype=bool)
+        for key, values in self.known.items():
+            if key in measurement_index:
+                i = measurement_index[key]
+                self.known_mask[i] = ~np.isnan(values)
+                self.all[i] = np.where(self.known_mask[i], values, self.all[i])
+        self.approximations = np.where(self.known_mask, np.nan, self.standard)
+        self.deviances = self.all - self.standard
+
+    @staticmethod
+    def from_array(values, keys, sizes=None, method="mean"):
+        "Bodies from a (bodies, measurements) array, with a column for each of keys"
+        values = np.asarray(values, dtype=np.float64)
+        return BodyMeasurementsBatch(
+            {key: values[:, i] for i, key in enumerate(keys)},
+            sizes=sizes,
+            method=method,
+        )
+
+    @staticmethod
+    def from_csv(file, method="mean", size_column="size"):
+        """Bodies from a csv file (or open file) with a header row of measurement names.
+
+        Empty cells are unknown measurements. Sizes are read from size_column
+        where they are given, and columns which aren't measurements are kept
+        in columns.
+        """
+        if isinstance(file, str):
+            with open(file, newline="", encoding="utf-8") as f:
+                return BodyMeasurementsBatch.from_csv(f, method, size_column)
+
+        reader = csv.reader(file)
+        header = next(reader)
+        rows = list(reader)
+        cells = {key: [row[i] for row in rows] for i, key in enumerate(header)}
+        known, columns, sizes = {}, {}, None
+        for key, values in cells.items():
+            try:
+                numbers = np.array(
+                    [value.strip() or "nan" for value in values], dtype=np.float64
+                )
+            except ValueError:
+                columns[key] = values
+                continue
+            if key == size_column:
+                sizes = numbers
+            else:
+                known[key] = numbers
+        return BodyMeasurementsBatch(known, sizes=sizes, method=method, columns=columns)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int) -> BodyMeasurements:
+        size = float(self.sizes[index])
+        if np.isnan(size):
+            raise Exception("Cannot estimate size")
+        known = {
+            key: float(values[index])
+            for key, values in self.known.items()
+            if not np.isnan(values[index])
+        }
+        return BodyMeasurements(size=size, **known)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def measurement(self, key: str) -> np.ndarray:
+        "One measurement of every body, known or approximated"
+        if key in measurement_index:
+            return self.all[measurement_index[key]]
+        return self.known[key]
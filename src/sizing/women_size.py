@@ -1,3 +1,5 @@
+import numpy as np
+
 # All measurements here are in cm
 # Source: Winnfred Owen page 13
 women_size_table_cm = {
@@ -58,24 +60,120 @@ women_size_table = {
     for key in women_size_table_cm
 }
 
-from scipy.interpolate import interp1d
+# Every measurement (in women_size_table order) at every size, one row per measurement
+sizes = np.arange(6, 27, 2, dtype=np.float64)
+measurement_names = list(women_size_table)
+measurement_index = {key: i for i, key in enumerate(measurement_names)}
+size_table = np.array([women_size_table[key] for key in measurement_names])
+
+
+def interpolate(x: np.ndarray, y: np.ndarray, x_new) -> np.ndarray:
+    """Straight lines between the points x, y (x sorted), and beyond the ends.
+
+    y can have a row of values for each x column, in which case each row is
+    interpolated at every x_new. Works just like scipy's interp1d with
+    fill_value="extrapolate".
+    """
+    x_new = np.asarray(x_new, dtype=np.float64)
+    # The segment each new x is in, with the end segments carrying on outwards
+    hi = np.searchsorted(x, x_new).clip(1, len(x) - 1)
+    lo = hi - 1
+    x_lo = x[lo]
+    y_lo, y_hi = y[..., lo], y[..., hi]
+    slope = (y_hi - y_lo) / (x[hi] - x_lo)
+    return slope * (x_new - x_lo) + y_lo
+
+
+class LinearInterpolation:
+    "A function going in straight lines through some points, like interp1d"
+
+    def __init__(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        order = np.argsort(x, kind="mergesort")
+        self.x = x[order]
+        self.y = np.asarray(y, dtype=np.float64)[order]
+
+    def __call__(self, x_new) -> np.ndarray:
+        return interpolate(self.x, self.y, x_new)
+
+
+def measurements_at_sizes(size) -> np.ndarray:
+    "Every measurement at a size, or an array of sizes (one column per size)"
+    return interpolate(sizes, size_table, size)
+
 
 size_to_measurement = {
-    key: interp1d(
-        range(6, 27, 2),
-        women_size_table[key],
-        bounds_error=False,
-        fill_value="extrapolate",
-    )
-    for key in women_size_table
+    key: LinearInterpolation(sizes, size_table[i])
+    for key, i in measurement_index.items()
 }
 
 measurement_to_size = {
-    key: interp1d(
-        women_size_table[key],
-        range(6, 27, 2),
-        bounds_error=False,
-        fill_value="extrapolate",
-    )
-    for key in women_size_table
+    key: LinearInterpolation(size_table[i], sizes)
+    for key, i in measurement_index.items()
 }
+
+
+def mean_sizes(known: dict) -> np.ndarray:
+    """The size each known measurement suggests, averaged, for arrays of measurements.
+
+    known maps measurement names to arrays, with nan where a measurement isn't
+    known. Sizes are nan where none of the measurements are known.
+    """
+    estimates = [
+        measurement_to_size[key](known[key])
+        for key in known
+        if key in measurement_to_size
+    ]
+    if not estimates:
+        return np.full(np.shape(next(iter(known.values()), [])), np.nan)
+    estimates = np.array(estimates, ndmin=2)
+    known_count = np.sum(~np.isnan(estimates), axis=0)
+    total = np.sum(np.where(np.isnan(estimates), 0.0, estimates), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(known_count > 0, total / known_count, np.nan)
+
+
+def least_squares_sizes(known: dict) -> np.ndarray:
+    """The size whose standard measurements are closest to the known ones, for arrays.
+
+    Closest means the smallest sum of squared differences in millimetres, so
+    every known measurement counts. Between two neighbouring sizes (and beyond
+    the ends) every measurement changes in a straight line, so the best size in
+    each of those ranges has a simple formula; the best of those is taken.
+    """
+    keys = [key for key in known if key in measurement_index]
+    if not keys:
+        return np.full(np.shape(next(iter(known.values()), [])), np.nan)
+    rows = [measurement_index[key] for key in keys]
+    measured = np.array([known[key] for key in keys], dtype=np.float64, ndmin=2)
+    weights = (~np.isnan(measured)).astype(np.float64)
+    measured = np.where(weights > 0, measured, 0.0)
+
+    # Each measurement is a + b * size between consecutive sizes (one column each)
+    table = size_table[rows]
+    b = np.diff(table, axis=1) / np.diff(sizes)
+    a = table[:, :-1] - b * sizes[:-1]
+    lowest = np.concatenate([[-np.inf], sizes[1:-1]])
+    highest = np.concatenate([sizes[1:-1], [np.inf]])
+
+    # Sums over the known measurements, for every body and range of sizes
+    bb = weights.T @ (b * b)
+    ab = weights.T @ (a * b)
+    aa = weights.T @ (a * a)
+    mb = measured.T @ b
+    ma = measured.T @ a
+    mm = np.sum(measured * measured, axis=0)[:, np.newaxis]
+
+    # Where the sum of squares (a quadratic in size) is smallest, kept in its range
+    with np.errstate(invalid="ignore", divide="ignore"):
+        best = (mb - ab) / bb
+    flat = ~(bb > 0)
+    # Any size in the range is as good as any other if nothing changes with size
+    anywhere = np.where(np.isfinite(lowest), lowest, highest)
+    best[flat] = np.broadcast_to(anywhere, best.shape)[flat]
+    best = np.clip(best, lowest, highest)
+    squares = mm - 2 * ma + aa - 2 * best * (mb - ab) + best * best * bb
+
+    segment = np.argmin(squares, axis=1)
+    result = best[np.arange(len(best)), segment]
+    return np.where(weights.any(axis=0), result, np.nan)
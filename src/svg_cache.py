@@ -0,0 +1,236 @@
+import functools
+import glob
+import hashlib
+import inspect
+import io
+import itertools
+import os
+import re
+from collections import OrderedDict
+
+# How many fragments to keep in memory before forgetting the least recently used
+default_cache_size = 4096
+
+# Ids inside a cached fragment, with any document prefixes they've been given
+fragment_ids = re.compile(r'(id="|#)(\w*?c[0-9a-f]{12}_)')
+
+
+@functools.cache
+def code_version() -> bytes:
+    """Hash of this package's source, so a disk cache never gives what older code drew.
+
+    Any change to the code might change the svg written for an object, so
+    fragments cached before it have different keys.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    source = os.path.dirname(os.path.abspath(__file__))
+    for filename in sorted(
+        glob.glob(os.path.join(source, "**", "*.py"), recursive=True)
+    ):
+        digest.update(os.path.relpath(filename, source).encode("utf-8"))
+        with open(filename, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def content_hash(*parts) -> str:
+    """Hex digest of some strings and bytes, each kept distinct from the next.
+
+    The code version is always included.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(code_version())
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        # Prefixing each part with its length stops ("ab", "c") matching ("a", "bc")
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def object_hash(object) -> str | None:
+    "The content hash of anything that has one, or None"
+    method = getattr(object, "content_hash", None)
+    return method() if callable(method) else None
+
+
+class SvgCache:
+    """Svg fragments which have already been written, keyed by content hash.
+
+    The most recently used fragments are kept in memory. With a directory they
+    are also saved there as files, so they survive between runs.
+    """
+
+    def __init__(self, maxsize=default_cache_size, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.fragments = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.fragments)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".svg")
+
+    def get(self, key: str) -> str | None:
+        fragment = self.fragments.get(key)
+        if fragment is not None:
+            self.fragments.move_to_end(key)
+            self.hits += 1
+            return fragment
+        if self.directory is not None:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    fragment = f.read()
+            except FileNotFoundError:
+                pass
+            else:
+                self.hits += 1
+                self._remember(key, fragment)
+                return fragment
+        self.misses += 1
+        return None
+
+    def put(self, key: str, fragment: str):
+        self._remember(key, fragment)
+        if self.directory is not None:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write somewhere else first, so a reader never sees half a fragment
+            temporary = "{}.{}.tmp".format(path, os.getpid())
+            with open(temporary, "w", encoding="utf-8") as f:
+                f.write(fragment)
+            os.replace(temporary, path)
+
+    def _remember(self, key: str, fragment: str):
+        self.fragments[key] = fragment
+        self.fragments.move_to_end(key)
+        while len(self.fragments) > self.maxsize:
+            self.fragments.popitem(last=False)
+
+    def clear(self):
+        "Forget everything in memory (anything on disk is kept)"
+        self.fragments.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def fragment(self, key: str, write) -> str:
+        "The fragment for key, calling write(output) to make it if it isn't cached"
+        fragment = self.get(key)
+        if fragment is None:
+            output = io.StringIO()
+            write(output)
+            fragment = output.getvalue()
+            self.put(key, fragment)
+        return fragment
+
+
+# Shared by render() and Group.svg() once use_svg_cache() turns them on, and by
+# SvgWriter(cache=True)
+svg_cache = SvgCache()
+svg_cache_enabled = False
+
+
+def use_svg_cache(enabled=True):
+    "Have render() and Group.svg() copy objects drawn before from the shared svg_cache"
+    global svg_cache_enabled
+    svg_cache_enabled = enabled
+
+
+def fragment_id_prefix(key: str) -> str:
+    "Ids in a cached fragment start with its hash, so they can't clash with others"
+    return "c{}_".format(key[:12])
+
+
+def place_fragment(fragment: str, document_id: str) -> str:
+    """The fragment with document_id in front of each of its ids.
+
+    document_id has to be new for every copy in a document, so that the same
+    fragment used twice doesn't repeat ids.
+    """
+    return fragment_ids.sub(
+        lambda match: match[1] + document_id + "_" + match[2], fragment
+    )
+
+
+# The methods (and their parameters) drawSvg 1.x calls on elements while writing a
+# drawing, which SvgFragment stands in for. They aren't documented, so could change.
+drawsvg_element_methods = {
+    "writeSvgElement": [
+        "self",
+        "idGen",
+        "isDuplicate",
+        "outputFile",
+        "dryRun",
+        "forceDup",
+    ],
+    "writeSvgDefs": ["self", "idGen", "isDuplicate", "outputFile", "dryRun"],
+    "getSvgDefs": ["self"],
+    "getLinkedElems": ["self"],
+}
+
+
+@functools.cache
+def drawsvg_supports_fragments() -> bool:
+    "Whether the installed drawSvg writes elements the way SvgFragment expects"
+    import drawSvg
+
+    element = getattr(drawSvg, "DrawingElement", None)
+    for name, parameters in drawsvg_element_methods.items():
+        method = getattr(element, name, None)
+        if method is None or list(inspect.signature(method).parameters) != parameters:
+            return False
+    return True
+
+
+class SvgFragment:
+    "Svg text which can be appended to a drawSvg drawing or group like any element"
+
+    def __init__(self, content: str):
+        self.content = content
+
+    def writeSvgElement(self, idGen, isDuplicate, outputFile, dryRun, forceDup=False):
+        if not dryRun:
+            # The drawing's own id generator gives each copy its ids
+            outputFile.write(place_fragment(self.content, idGen()))
+
+    def writeSvgDefs(self, idGen, isDuplicate, outputFile, dryRun):
+        # Any definitions are already inside the fragment
+        pass
+
+    def getSvgDefs(self):
+        return ()
+
+    def getLinkedElems(self):
+        return ()
+
+
+def cached_svg(object, cache=None):
+    """object.svg(), or the same svg from the cache if the object has a content hash.
+
+    Only objects which aren't in the cache yet have their drawSvg elements made.
+    Without a cache, the shared svg_cache is used if use_svg_cache() has turned
+    it on.
+    """
+    from src.svg_writer import write_drawing_element
+
+    if cache is None and svg_cache_enabled:
+        cache = svg_cache
+    key = object_hash(object) if cache is not None else None
+    if key is None or not drawsvg_supports_fragments():
+        return object.svg()
+
+    def write(output):
+        ids = itertools.count()
+        prefix = fragment_id_prefix(key)
+        write_drawing_element(
+            object.svg(),
+            output,
+            lambda base="": "{}{}{}".format(prefix, next(ids), base),
+        )
+
+    # drawSvg writes a newline after each element itself
+    return SvgFragment(cache.fragment(key + "-drawsvg", write).rstrip("\n"))
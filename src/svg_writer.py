@@ -0,0 +1,299 @@
+import io
+
+import numpy as np
+
+# xml.sax.saxutils imports urllib, so it is only imported once svg is written
+
+
+def escape(text: str) -> str:
+    from xml.sax import saxutils
+
+    return saxutils.escape(text)
+
+
+def quoteattr(text: str) -> str:
+    from xml.sax import saxutils
+
+    return saxutils.quoteattr(text)
+
+
+def format_numbers(values, precision=None) -> list[str]:
+    "Numbers as svg text, rounded to precision decimal places (without trailing zeros)"
+    values = np.asarray(values, dtype=np.float64)
+    if precision is None:
+        return [str(value) for value in values.ravel().tolist()]
+    # Adding zero turns any -0.0 left by rounding into 0.0
+    rounded = np.round(values, precision) + 0.0
+    strings = [repr(value) for value in rounded.ravel().tolist()]
+    return [s[:-2] if s.endswith(".0") else s for s in strings]
+
+
+def polyline_path_data(coordinates: np.ndarray, precision=None, relative=False) -> str:
+    """The `d` attribute of an svg <path> through an (N, 2) array of coordinates.
+
+    Relative commands give each point as a step from the one before, which is
+    usually much shorter text. The steps are taken between rounded points so
+    that rounding errors can't add up along the path.
+    """
+    # svg has the y axis pointing downwards
+    flipped = coordinates * (1.0, -1.0)
+    if not relative:
+        numbers = format_numbers(flipped, precision)
+        pairs = [x + "," + y for x, y in zip(numbers[::2], numbers[1::2])]
+        return "M" + " L".join(pairs)
+    if precision is not None:
+        flipped = np.round(flipped, precision)
+    steps = np.diff(flipped, axis=0)
+    start = format_numbers(flipped[0], precision)
+    numbers = format_numbers(steps, precision)
+    pairs = [x + "," + y for x, y in zip(numbers[::2], numbers[1::2])]
+    # Start with an absolute move, so paths can be joined one after another
+    d = "M{},{}".format(*start)
+    if pairs:
+        d += " l" + " ".join(pairs)
+    return d
+
+
+def svg_attributes(**attributes) -> str:
+    "Attributes written the way drawSvg does, with underscores in names becoming dashes"
+    return "".join(
+        " {}={}".format(
+            name.replace("__", ":").replace("_", "-"), quoteattr(str(value))
+        )
+        for name, value in attributes.items()
+        if value is not None
+    )
+
+
+def write_drawing_element(element, output: io.TextIOBase, id_generator):
+    "Write a drawSvg element, with any definitions it needs just before it"
+    seen = set()
+
+    def is_duplicate(obj):
+        duplicate = id(obj) in seen
+        seen.add(id(obj))
+        return duplicate
+
+    def new_id(base=""):
+        return id_generator() + base
+
+    definitions = io.StringIO()
+    element.writeSvgDefs(new_id, is_duplicate, definitions, False)
+    if definitions.tell():
+        # Definitions can go anywhere in svg, so each element gets its own
+        output.write("<defs>\n{}</defs>\n".format(definitions.getvalue()))
+
+    # Like drawSvg, a dry run first hands out ids to anything referred to twice
+    defined = set(seen)
+    element.writeSvgElement(new_id, is_duplicate, output, True)
+    seen = defined
+    element.writeSvgElement(new_id, is_duplicate, output, False)
+    output.write("\n")
+
+
+class SvgWriter:
+    """Writes an svg document to a text stream one element at a time.
+
+    Nothing is kept once it has been written, so memory use doesn't grow with
+    the size of the drawing. Coordinates are given with the y axis pointing up,
+    like everywhere else, and flipped as they are written.
+    """
+
+    def __init__(
+        self,
+        output: io.TextIOBase,
+        rect,
+        precision=None,
+        relative=False,
+        units="",
+        cache=None,
+        **attributes
+    ):
+        self.output = output
+        # An SvgCache for objects with a content hash, True for the shared one, or None
+        self.cache = cache
+        # How many decimal places to write coordinates with, all of them if None
+        self.precision = precision
+        self.relative = relative
+        self.id_prefix = "s"
+        self.id_index = 0
+        output.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<svg xmlns="http://www.w3.org/2000/svg"\n'
+            '     xmlns:xlink="http://www.w3.org/1999/xlink"\n'
+            '     width="{}{}" height="{}{}" viewBox="{} {} {} {}"'.format(
+                rect.width,
+                units,
+                rect.height,
+                units,
+                rect.left,
+                -rect.top,
+                rect.width,
+                rect.height,
+            )
+        )
+        output.write(svg_attributes(**attributes))
+        output.write(">\n")
+
+    def new_id(self) -> str:
+        id = "{}{}".format(self.id_prefix, self.id_index)
+        self.id_index += 1
+        return id
+
+    def path(self, d: str, **attributes):
+        self.output.write(
+            "<path d={}{} />\n".format(quoteattr(d), svg_attributes(**attributes))
+        )
+
+    def polyline_path_data(self, coordinates) -> str:
+        return polyline_path_data(
+            np.asarray(coordinates, dtype=np.float64), self.precision, self.relative
+        )
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, **attributes):
+        self.path(self.polyline_path_data([(x1, y1), (x2, y2)]), **attributes)
+
+    def lines(self, lines, **attributes):
+        "Many separate straight lines, each as x1, y1, x2, y2, drawn as one <path>"
+        d = " ".join(
+            self.polyline_path_data([(x1, y1), (x2, y2)]) for x1, y1, x2, y2 in lines
+        )
+        if d:
+            self.path(d, **attributes)
+
+    def grid_pattern(self, rect, size: float, origin=(0, 0), **attributes):
+        """Fill rect with square grid lines every size apart (passing through origin).
+
+        The lines are drawn once inside an svg <pattern>, which the rectangle
+        is filled with, instead of writing every line out.
+        """
+        pattern_id = self.new_id()
+        numbers = format_numbers([origin[0], -origin[1], size], self.precision)
+        self.output.write(
+            '<defs>\n<pattern id="{}" patternUnits="userSpaceOnUse" '
+            'x="{}" y="{}" width="{}" height="{}">\n'.format(
+                pattern_id, numbers[0], numbers[1], numbers[2], numbers[2]
+            )
+        )
+        # The left and top edges of the tile, which join up into the grid
+        self.path(
+            "M0,{size} V0 H{size}".format(size=numbers[2]), fill="none", **attributes
+        )
+        self.output.write("</pattern>\n</defs>\n")
+        numbers = format_numbers(
+            [rect.left, -rect.top, rect.width, rect.height], self.precision
+        )
+        self.output.write(
+            '<rect x="{}" y="{}" width="{}" height="{}" '
+            'fill="url(#{})" stroke="none" />\n'.format(*numbers, pattern_id)
+        )
+
+    def text(self, text: str, font_size: float, x: float, y: float, **attributes):
+        lines = text.splitlines()
+        x, y = format_numbers([x, -y], self.precision)
+        if len(lines) > 1:
+            # One <tspan> per line, each a line further down
+            content = "".join(
+                '<tspan x="{}" dy="{}em">{}</tspan>'.format(
+                    x, 1 if i else 0, escape(line)
+                )
+                for i, line in enumerate(lines)
+            )
+        else:
+            content = escape(text)
+        self.output.write(
+            '<text x="{}" y="{}" font-size="{}"{}>{}</text>\n'.format(
+                x, y, font_size, svg_attributes(**attributes), content
+            )
+        )
+
+    def text_on_path(
+        self,
+        text: str,
+        font_size: float,
+        d: str,
+        start_offset=None,
+        line_offset=0,
+        **attributes
+    ):
+        "Text along a path (given as path data), one <text> per line like drawSvg"
+        path_id = self.new_id()
+        self.output.write(
+            '<defs>\n<path d={} id="{}" />\n</defs>\n'.format(quoteattr(d), path_id)
+        )
+        for i, line in enumerate(text.splitlines()):
+            if not line:
+                continue
+            self.output.write(
+                '<text font-size="{}"{}><textPath xlink:href="#{}"{}>'
+                '<tspan dy="{}em">{}</tspan></textPath></text>\n'.format(
+                    font_size,
+                    svg_attributes(**attributes),
+                    path_id,
+                    svg_attributes(startOffset=start_offset),
+                    line_offset + i,
+                    escape(line),
+                )
+            )
+
+    def circle(self, x: float, y: float, radius: float, **attributes):
+        x, y = format_numbers([x, -y], self.precision)
+        self.output.write(
+            '<circle cx="{}" cy="{}" r="{}"{} />\n'.format(
+                x, y, radius, svg_attributes(**attributes)
+            )
+        )
+
+    def begin_group(self, **attributes):
+        self.output.write("<g{}>\n".format(svg_attributes(**attributes)))
+
+    def end_group(self):
+        self.output.write("</g>\n")
+
+    def drawing_element(self, element):
+        "Write a drawSvg element (and any definitions it needs) straight away"
+        write_drawing_element(element, self.output, self.new_id)
+
+    def object(self, object):
+        """Write anything that can draw itself, streaming it if it knows how.
+
+        With a cache, objects with a content hash are written once and then
+        copied from it whenever they are written again.
+        """
+        from src.svg_cache import (
+            fragment_id_prefix,
+            object_hash,
+            place_fragment,
+            svg_cache,
+        )
+
+        key = object_hash(object)
+        if key is None or self.cache is None:
+            return self._write_object(object)
+        key = "{}-{}{}".format(key, self.precision, "r" if self.relative else "a")
+
+        def write(output):
+            # Write to the fragment instead, with ids that belong to it
+            saved = self.output, self.id_prefix, self.id_index
+            self.output, self.id_prefix, self.id_index = (
+                output,
+                fragment_id_prefix(key),
+                0,
+            )
+            try:
+                self._write_object(object)
+            finally:
+                self.output, self.id_prefix, self.id_index = saved
+
+        cache = svg_cache if self.cache is True else self.cache
+        self.output.write(place_fragment(cache.fragment(key, write), self.new_id()))
+
+    def _write_object(self, object):
+        write_svg = getattr(object, "write_svg", None)
+        if callable(write_svg):
+            write_svg(self)
+        else:
+            self.drawing_element(object.svg())
+
+    def close(self):
+        self.output.write("</svg>\n")
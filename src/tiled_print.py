@@ -0,0 +1,600 @@
+import math
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.geometry.LineSegment import LineSegment
+from src.geometry.Rectangle import Rectangle, minimumBoundingRect
+from src.geometry.Shape import Shape, streamed_svg_styles
+from src.geometry.Vector import Vector
+from src.render import n2a
+from src.svg_writer import SvgWriter, polyline_path_data
+
+# Landscape A4, the same as the sheets on the grid render() draws
+page_width = 297
+page_height = 210
+# How much each page repeats of its neighbours, for lining them up and taping together
+default_overlap = 15
+registration_mark_size = 5
+label_font_size = 12
+page_name_font_size = 10
+points_per_mm = 72 / 25.4
+# Decimal places for coordinates on the pages, a hundredth of a millimetre
+page_precision = 2
+# The standard pdf fonts' WinAnsiEncoding, near enough
+pdf_encoding = "cp1252"
+# Helvetica's characters are about half as wide as they are tall
+average_character_width = 0.5
+
+# The Symbol font has the greek letters page names use in place of latin ones
+greek_to_symbol = str.maketrans(
+    "αβγδεζηθικλμνξοπρςστυφχψω", "abgdezhqiklmnxoprVstufcyw"
+)
+
+faint_color = "#999999"
+arrowhead_length = 8
+# How far the notches at the ends of a tape reach either side of it
+tape_notch_size = 5
+
+
+class PrintItem:
+    """One thing to draw on the pages: a path, a point or some text.
+
+    Text with a single coordinate is written level, starting there (or centred
+    on it when anchor is "middle"). Text with more coordinates runs along them
+    like the svg <textPath> of Shape.svg_parallel_label, start_offset along the
+    path and line_offset lines above it.
+
+    Only plain arrays and strings are kept, so pages are cheap to send to
+    other processes.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        coordinates,
+        style="line",
+        label=None,
+        color="#000000",
+        font_size=label_font_size,
+        start_offset=0,
+        line_offset=0,
+        anchor="start",
+    ):
+        self.kind = kind
+        self.coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        self.style = style
+        self.label = label
+        self.color = color
+        self.font_size = font_size
+        self.start_offset = start_offset
+        self.line_offset = line_offset
+        self.anchor = anchor
+
+    def bounds(self):
+        "Left, bottom, right and top of the item (generously, for points and text)"
+        lower = self.coordinates.min(axis=0)
+        upper = self.coordinates.max(axis=0)
+        if self.kind == "text":
+            # Leave room for the text, as its size is only known once it's drawn
+            lines = self.label.splitlines() or [""]
+            width = self.font_size * max(len(line) for line in lines)
+            height = self.font_size * (len(lines) + abs(self.line_offset))
+            if len(self.coordinates) == 1 and self.anchor == "start":
+                upper = upper + (width, height)
+                lower = lower - height
+            else:
+                # Centred or turned text could reach out in any direction
+                upper = upper + max(width, height)
+                lower = lower - max(width, height)
+        elif self.kind == "point":
+            upper = upper + 1
+            lower = lower - 1
+        return (*lower.tolist(), *upper.tolist())
+
+    def text_position(self):
+        "Where the text starts and the unit direction it runs in"
+        level = np.array([1.0, 0.0])
+        if len(self.coordinates) == 1:
+            return self.coordinates[0], level
+        steps = np.diff(self.coordinates, axis=0)
+        lengths = np.hypot(steps[:, 0], steps[:, 1])
+        moving = lengths > 0
+        if not moving.any():
+            return self.coordinates[0], level
+        starts = self.coordinates[:-1][moving]
+        steps, lengths = steps[moving], lengths[moving]
+        ends = np.cumsum(lengths)
+        offset = min(self.start_offset, ends[-1])
+        segment = int(np.searchsorted(ends, offset))
+        before = ends[segment] - lengths[segment]
+        direction = steps[segment] / lengths[segment]
+        return starts[segment] + direction * (offset - before), direction
+
+
+def parallel_label(shape: Shape, label: str, **kwargs) -> PrintItem:
+    "Text along the shape, like Shape.svg_parallel_label"
+    return PrintItem(
+        "text",
+        shape.coordinates,
+        label=label,
+        start_offset=10,
+        line_offset=-1,
+        **kwargs
+    )
+
+
+def shape_print_items(shape: Shape):
+    "The items drawing a shape, the same way Shape.svg() does for each style"
+    style = shape.style
+    coordinates = shape.coordinates
+    if style not in shape_styles:
+        raise ValueError("Unable to print unexpected polyline style:", style)
+
+    if style in ("pointset", "join_the_dots"):
+        for x, y in coordinates.tolist():
+            yield PrintItem("point", [(x, y)])
+    if style == "notch":
+        yield PrintItem("path", coordinates, "filled")
+    elif style in ("dashed", "dashed_arrow"):
+        yield PrintItem("path", coordinates, "dashed")
+    elif style == "polygon":
+        yield PrintItem("path", coordinates, "polygon")
+    elif style == "faint_ruler":
+        yield PrintItem("path", coordinates, color=faint_color)
+    elif style != "pointset":
+        yield PrintItem("path", coordinates)
+
+    if style in ("arrow", "dashed_arrow"):
+        yield from arrowhead(coordinates)
+    elif style == "tape":
+        along = shape.points_along([0, shape.length])
+        for point, normal in zip(along.points, along.normals * tape_notch_size):
+            yield PrintItem("path", [point - normal, point + normal])
+        label = "{:.1f}mm".format(shape.length)
+        yield parallel_label(
+            shape, "{} ({})".format(shape.label, label) if shape.label else label
+        )
+        return
+    elif style == "ruler":
+        yield from ruler_markings(shape)
+    elif style == "faint_ruler":
+        yield from ruler_markings(shape, font_size=6, color=faint_color)
+    elif style == "all_guides":
+        for side in shape.numbered_sides():
+            yield parallel_label(side, side.label)
+
+    if not shape.label:
+        return
+    if style == "notch":
+        yield PrintItem("text", [(shape.right, shape.bottom)], label=shape.label)
+    elif style == "pointset":
+        center = shape.center_of_mass()
+        yield PrintItem(
+            "text", [(center.x, center.y)], label=shape.label, anchor="middle"
+        )
+    elif style != "all_guides":
+        yield parallel_label(shape, shape.label)
+
+
+# Every style Shape.svg() can draw
+shape_styles = {
+    "line",
+    "dashed",
+    "pointset",
+    "polygon",
+    "tape",
+    "ruler",
+    "faint_ruler",
+    "arrow",
+    "dashed_arrow",
+    "join_the_dots",
+    "all_guides",
+    "notch",
+}
+
+
+def arrowhead(coordinates: np.ndarray):
+    "A filled triangle at the end of a path, the size of Shape.svg_arrow's marker"
+    steps = np.diff(coordinates, axis=0)
+    lengths = np.hypot(steps[:, 0], steps[:, 1])
+    moving = np.flatnonzero(lengths)
+    if not len(moving):
+        return
+    direction = steps[moving[-1]] / lengths[moving[-1]]
+    normal = np.array([-direction[1], direction[0]])
+    tip = coordinates[-1]
+    base = tip - arrowhead_length * direction
+    half = normal * arrowhead_length / 2
+    yield PrintItem("path", [tip, base + half, base - half, tip], "filled")
+
+
+def ruler_markings(shape: Shape, step=10, font_size=label_font_size, color="#000000"):
+    "A tick and measurement every step along the shape, like Shape.svg_ruler_markings"
+    along = shape.points_along(np.arange(0, shape.length, step))
+    for w, point, normal in zip(along.distances.tolist(), along.points, along.normals):
+        yield PrintItem("path", [point, point - 3 * normal], color=color)
+        yield PrintItem(
+            "text",
+            [point - 4 * normal, point - 104 * normal],
+            label="{:.0f}mm".format(w),
+            color=color,
+            font_size=font_size,
+        )
+
+
+def print_items(object):
+    "Break any drawable object down into PrintItems"
+    if isinstance(object, Shape):
+        if object.number_of_points:
+            yield from shape_print_items(object)
+    elif isinstance(object, Vector):
+        yield PrintItem("point", [(object.x, object.y)])
+        if object.labelText():
+            yield PrintItem(
+                "text", [(object.x + 2, object.y + 2)], label=object.labelText()
+            )
+    elif isinstance(object, LineSegment):
+        yield PrintItem(
+            "path", [(object.start.x, object.start.y), (object.end.x, object.end.y)]
+        )
+    elif callable(getattr(object, "iterate_objects", None)):
+        for child in object.iterate_objects():
+            yield from print_items(child)
+        if getattr(object, "label", None):
+            midpoint = object.midpoint()
+            yield PrintItem("text", [(midpoint.x, midpoint.y)], label=object.label)
+    elif callable(getattr(object, "shape", None)):
+        # Notches and anything else which can turn itself into a shape
+        yield from print_items(object.shape())
+    else:
+        raise ValueError("Unable to print unexpected object:", object)
+
+
+class PrintPage:
+    "One sheet: its name, the part of the drawing it shows and the items on it"
+
+    def __init__(
+        self, name: str, rect: Rectangle, items: list[PrintItem], overlap: float
+    ):
+        self.name = name
+        self.rect = rect
+        self.items = items
+        self.overlap = overlap
+
+    def registration_marks(self) -> list[tuple[float, float]]:
+        "Where the marks go, halfway into the overlap so the next page has them too"
+        inset = self.overlap / 2
+        return [
+            (x, y)
+            for x in (self.rect.left + inset, self.rect.right - inset)
+            for y in (self.rect.bottom + inset, self.rect.top - inset)
+        ]
+
+
+def print_pages(*objects, overlap=default_overlap) -> list[PrintPage]:
+    """Cut a drawing into overlapping pages, each with the items whose bounds reach it.
+
+    Pages are named like the sheets on render()'s grid, a greek letter for the
+    column and a number for the row counting up from the bottom.
+    """
+    items = [item for object in objects for item in print_items(object)]
+    bounds = np.array([item.bounds() for item in items]).reshape(-1, 4)
+    drawing = minimumBoundingRect(objects)
+
+    step_x = page_width - overlap
+    step_y = page_height - overlap
+    columns = max(1, math.ceil((drawing.width - overlap) / step_x))
+    rows = max(1, math.ceil((drawing.height - overlap) / step_y))
+    # Centre the drawing on the pages
+    left = drawing.left - (columns * step_x + overlap - drawing.width) / 2
+    bottom = drawing.bottom - (rows * step_y + overlap - drawing.height) / 2
+
+    pages = []
+    for column in range(columns):
+        for row in range(rows):
+            x = left + column * step_x
+            y = bottom + row * step_y
+            rect = Rectangle(
+                left=x, top=y + page_height, right=x + page_width, bottom=y
+            )
+            on_page = (
+                (bounds[:, 0] <= rect.right)
+                & (bounds[:, 2] >= rect.left)
+                & (bounds[:, 1] <= rect.top)
+                & (bounds[:, 3] >= rect.bottom)
+            )
+            name = "{}{}".format(n2a(column), row)
+            pages.append(
+                PrintPage(
+                    name, rect, [items[i] for i in np.flatnonzero(on_page)], overlap
+                )
+            )
+    return pages
+
+
+def map_pages(function, pages, *arguments, processes=None):
+    "Call function on every page, spread over a pool of processes unless processes is 1"
+    if processes == 1 or len(pages) == 1:
+        return list(map(function, pages, *arguments))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(function, pages, *arguments))
+
+
+# PDF
+
+
+def pdf_text(text: str) -> str:
+    """A string for a pdf content stream, with the characters that need it escaped.
+
+    Pages only use the standard pdf fonts, which have just the WinAnsi
+    characters (cp1252: latin letters, accents and some punctuation). Anything
+    else, like a greek or chinese label, is printed as "?".
+    """
+    text = text.encode(pdf_encoding, "replace").decode(pdf_encoding)
+    return "({})".format(
+        text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    )
+
+
+def pdf_color(color: str) -> str:
+    "The red, green and blue operands for an svg color like #999999"
+    return " ".join(
+        "{:.3f}".format(int(color[i : i + 2], 16) / 255).rstrip("0").rstrip(".") or "0"
+        for i in (1, 3, 5)
+    )
+
+
+def pdf_path(points: np.ndarray) -> str:
+    "Path construction operators for a polyline, in points"
+    commands = ["{:.2f} {:.2f} m".format(*points[0])]
+    commands += ["{:.2f} {:.2f} l".format(x, y) for x, y in points[1:].tolist()]
+    return " ".join(commands)
+
+
+def pdf_circle(x: float, y: float, radius: float) -> str:
+    "A circle made of four bezier curves"
+    k = 0.5523 * radius
+    return " ".join(
+        [
+            "{:.2f} {:.2f} m".format(x + radius, y),
+            "{:.2f} {:.2f} {:.2f} {:.2f} {:.2f} {:.2f} c".format(
+                x + radius, y + k, x + k, y + radius, x, y + radius
+            ),
+            "{:.2f} {:.2f} {:.2f} {:.2f} {:.2f} {:.2f} c".format(
+                x - k, y + radius, x - radius, y + k, x - radius, y
+            ),
+            "{:.2f} {:.2f} {:.2f} {:.2f} {:.2f} {:.2f} c".format(
+                x - radius, y - k, x - k, y - radius, x, y - radius
+            ),
+            "{:.2f} {:.2f} {:.2f} {:.2f} {:.2f} {:.2f} c".format(
+                x + k, y - radius, x + radius, y - k, x + radius, y
+            ),
+        ]
+    )
+
+
+def pdf_label(
+    text: str, x: float, y: float, size: float, font="F1", direction=(1, 0)
+) -> str:
+    "Text with its first line at x, y running in direction, and any more lines below it"
+    a, b = direction
+    lines = [
+        "BT /{} {:.2f} Tf {:.2f} TL "
+        "{:.4f} {:.4f} {:.4f} {:.4f} {:.2f} {:.2f} Tm".format(
+            font, size, size, a, b, -b, a, x, y
+        )
+    ]
+    for i, line in enumerate(text.splitlines()):
+        lines.append(("" if i == 0 else "T* ") + pdf_text(line) + " Tj")
+    lines.append("ET")
+    return "\n".join(lines)
+
+
+def page_pdf_content(page: PrintPage) -> bytes:
+    "The pdf content stream drawing one page, at full size"
+    origin = (page.rect.left, page.rect.bottom)
+    scale = points_per_mm
+    ops = ["0.5 w 1 j 1 J"]
+    for item in page.items:
+        points = (item.coordinates - origin) * scale
+        color = pdf_color(item.color)
+        if item.kind == "path":
+            if item.style == "filled":
+                ops.append("{} rg {} f".format(color, pdf_path(points)))
+            elif item.style == "polygon":
+                ops.append(
+                    "{} RG 0.902 0.902 0.98 rg {} B".format(color, pdf_path(points))
+                )
+            elif item.style == "dashed":
+                ops.append(
+                    "{} RG [{:.2f}] 0 d {} S [] 0 d".format(
+                        color, 3 * scale, pdf_path(points)
+                    )
+                )
+            else:
+                ops.append("{} RG {} S".format(color, pdf_path(points)))
+        elif item.kind == "point":
+            ops.append(
+                "{} rg {} f".format(color, pdf_circle(*points[0].tolist(), scale))
+            )
+        else:
+            position, direction = item.text_position()
+            normal = np.array([-direction[1], direction[0]])
+            position = position - normal * item.line_offset * item.font_size
+            if item.anchor == "middle":
+                # There are no font metrics here, so centre on a typical width
+                width = average_character_width * item.font_size * len(item.label)
+                position = position - direction * width / 2
+            x, y = ((position - origin) * scale).tolist()
+            ops.append("{} rg".format(color))
+            ops.append(
+                pdf_label(
+                    item.label,
+                    x,
+                    y,
+                    item.font_size * scale,
+                    direction=direction.tolist(),
+                )
+            )
+
+    # Registration marks and the page's name, in the overlap
+    size = registration_mark_size * scale
+    ops.append("0.25 w 0 G")
+    for x, y in page.registration_marks():
+        x, y = (x - origin[0]) * scale, (y - origin[1]) * scale
+        ops.append(
+            "{:.2f} {:.2f} m {:.2f} {:.2f} l {:.2f} {:.2f} m {:.2f} {:.2f} l S".format(
+                x - size, y, x + size, y, x, y - size, x, y + size
+            )
+        )
+        ops.append("{} S".format(pdf_circle(x, y, size / 2)))
+    inset = page.overlap * scale
+    ops.append("0.5 g")
+    ops.append(
+        pdf_label(
+            page.name.translate(greek_to_symbol),
+            inset + size,
+            inset + size,
+            page_name_font_size * scale,
+            font="F2",
+        )
+    )
+    return "\n".join(ops).encode(pdf_encoding, "replace")
+
+
+def pdf_document(contents: list[bytes], width: float, height: float) -> bytes:
+    "A pdf with a page for each content stream, using only the standard fonts"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join("{} 0 R".format(5 + 2 * i) for i in range(len(contents))),
+            len(contents),
+        ).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Symbol >>",
+    ]
+    for i, content in enumerate(contents):
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {:.2f} {:.2f}] "
+            "/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+            "/Contents {} 0 R >>".format(width, height, 6 + 2 * i).encode()
+        )
+        compressed = zlib.compress(content)
+        objects.append(
+            "<< /Length {} /Filter /FlateDecode >>\nstream\n".format(
+                len(compressed)
+            ).encode()
+            + compressed
+            + b"\nendstream"
+        )
+
+    document = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(document))
+        document += "{} 0 obj\n".format(number).encode() + body + b"\nendobj\n"
+    xref = len(document)
+    document += "xref\n0 {}\n0000000000 65535 f \n".format(len(objects) + 1).encode()
+    document += "".join(
+        "{:010d} 00000 n \n".format(offset) for offset in offsets
+    ).encode()
+    document += "trailer\n<< /Size {} /Root 1 0 R >>\nstartxref\n{}\n%%EOF\n".format(
+        len(objects) + 1, xref
+    ).encode()
+    return bytes(document)
+
+
+def print_pdf(filename: str, *objects, overlap=default_overlap, processes=None):
+    "Write the drawing at full size as a multi-page A4 pdf, rendering pages in parallel"
+    pages = print_pages(*objects, overlap=overlap)
+    contents = map_pages(page_pdf_content, pages, processes=processes)
+    with open(filename, "wb") as f:
+        f.write(
+            pdf_document(
+                contents, page_width * points_per_mm, page_height * points_per_mm
+            )
+        )
+    return pages
+
+
+# SVG
+
+
+def write_svg_page(page: PrintPage, filename: str) -> str:
+    "Write one page as an svg sized in millimetres"
+    with open(filename, "w", encoding="utf-8") as f:
+        writer = SvgWriter(
+            f,
+            page.rect,
+            precision=page_precision,
+            units="mm",
+            stroke="black",
+            fill="none",
+        )
+        for item in page.items:
+            x, y = item.coordinates[0].tolist()
+            if item.kind == "path":
+                d = polyline_path_data(item.coordinates, page_precision, relative=True)
+                if item.style == "filled":
+                    writer.path(d, fill=item.color, stroke="none")
+                else:
+                    writer.path(
+                        d, **{**streamed_svg_styles[item.style], "stroke": item.color}
+                    )
+            elif item.kind == "point":
+                writer.circle(x, y, 1, fill=item.color)
+            elif len(item.coordinates) == 1:
+                writer.text(
+                    item.label,
+                    item.font_size,
+                    x,
+                    y,
+                    fill=item.color,
+                    stroke="none",
+                    text_anchor="middle" if item.anchor == "middle" else None,
+                )
+            else:
+                writer.text_on_path(
+                    item.label,
+                    item.font_size,
+                    polyline_path_data(item.coordinates, page_precision, relative=True),
+                    start_offset=item.start_offset or None,
+                    line_offset=item.line_offset,
+                    stroke="none",
+                    fill=item.color,
+                )
+
+        size = registration_mark_size
+        for x, y in page.registration_marks():
+            writer.lines(
+                [(x - size, y, x + size, y), (x, y - size, x, y + size)],
+                stroke_width=0.25,
+            )
+            writer.circle(x, y, size / 2, stroke_width=0.25)
+        inset = page.overlap + size
+        writer.text(
+            page.name,
+            page_name_font_size,
+            page.rect.left + inset,
+            page.rect.bottom + inset,
+            stroke="none",
+            fill="#808080",
+        )
+        writer.close()
+    return filename
+
+
+def print_svgs(
+    prefix: str, *objects, overlap=default_overlap, processes=None
+) -> list[str]:
+    "Write the drawing at full size as one A4 svg per page, named prefix-<page>.svg"
+    pages = print_pages(*objects, overlap=overlap)
+    filenames = ["{}-{}.svg".format(prefix, page.name) for page in pages]
+    directory = os.path.dirname(prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return map_pages(write_svg_page, pages, filenames, processes=processes)
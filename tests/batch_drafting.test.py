@@ -0,0 +1,41 @@
+import unittest
+
+from src.batch_drafting import draft_batch, draft_many, size_run
+from src.geometry.Group import Group
+from src.sizing.BodyMeasurements import BodyMeasurements
+from TheClassicTailoredTrouserBlock import TheClassicTailoredTrouserBlock
+
+
+class TestBatchDrafting(unittest.TestCase):
+    def test_drafts_every_body(self):
+        bodies = [BodyMeasurements(size=10), BodyMeasurements(hips=1000, waist=760)]
+        for processes in [1, 2]:
+            results = sorted(
+                draft_many(TheClassicTailoredTrouserBlock, bodies, processes=processes),
+                key=lambda result: result[0],
+            )
+            self.assertEqual([index for index, _, _ in results], [0, 1])
+            for index, body, pattern in results:
+                self.assertIs(body, bodies[index])
+                expected = TheClassicTailoredTrouserBlock(body=body)
+                self.assertIsInstance(pattern, Group)
+                self.assertEqual(list(pattern.objects), list(expected.objects))
+                self.assertEqual(
+                    pattern["front"].content_hash(), expected["front"].content_hash()
+                )
+
+    def test_sink_gets_bodies_from_a_generator(self):
+        sizes = []
+        count = draft_batch(
+            TheClassicTailoredTrouserBlock,
+            size_run(range(6, 28, 2)),
+            lambda index, body, pattern: sizes.append(body.size),
+            processes=2,
+            bottomWidth=200,
+        )
+        self.assertEqual(count, 11)
+        self.assertEqual(sorted(sizes), list(range(6, 28, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import io
+import unittest
+
+import numpy as np
+
+from src.sizing.BodyMeasurements import BodyMeasurements
+from src.sizing.BodyMeasurementsBatch import BodyMeasurementsBatch
+from src.sizing.women_size import measurement_index
+
+customers_csv = """name,waist,hips,bust,size,palm_circumference
+Ada,720,960,,,200
+Bea,,1000,,,
+Cat,760,1000,930,,
+Dot,,,,18,
+Eve,,,,,
+"""
+
+
+class TestBodyMeasurementsBatch(unittest.TestCase):
+    def test_matches_body_measurements(self):
+        batch = BodyMeasurementsBatch.from_csv(io.StringIO(customers_csv))
+        self.assertEqual(len(batch), 5)
+        self.assertEqual(batch.columns["name"], ["Ada", "Bea", "Cat", "Dot", "Eve"])
+        self.assertEqual(batch.sizes[3], 18)
+        self.assertTrue(np.isnan(batch.sizes[4]))
+
+        expected = [
+            BodyMeasurements(waist=720, hips=960, palm_circumference=200),
+            BodyMeasurements(hips=1000),
+            BodyMeasurements(waist=760, hips=1000, bust=930),
+            BodyMeasurements(size=18),
+        ]
+        for i, body in enumerate(expected):
+            self.assertAlmostEqual(batch.sizes[i], body.size)
+            from_batch = batch[i]
+            self.assertEqual(from_batch.known, body.known)
+            for key, value in body.deviances().items():
+                self.assertAlmostEqual(
+                    batch.deviances[measurement_index[key], i], value
+                )
+                self.assertAlmostEqual(from_batch.all[key], body.all[key])
+            for key, value in body.approximations.items():
+                self.assertAlmostEqual(
+                    batch.approximations[measurement_index[key], i], value
+                )
+        self.assertTrue(np.isnan(batch.approximations[measurement_index["waist"], 0]))
+        self.assertEqual(list(batch.measurement("palm_circumference")[:1]), [200])
+        with self.assertRaises(Exception):
+            batch[4]
+
+    def test_least_squares(self):
+        standard = BodyMeasurements(size=16)
+        keys = ["waist", "hips", "bust", "wrist"]
+        values = [[standard.all[key] for key in keys], [700, 1000, np.nan, 160]]
+        batch = BodyMeasurementsBatch.from_array(values, keys, method="least_squares")
+        self.assertAlmostEqual(batch.sizes[0], 16)
+
+        # Nowhere else fits the second body better
+        def squares(size):
+            body = BodyMeasurements(size=size)
+            known = [
+                (key, value) for key, value in zip(keys, values[1]) if value == value
+            ]
+            return sum((body.all[key] - value) ** 2 for key, value in known)
+
+        best = squares(batch.sizes[1])
+        for size in np.linspace(0, 30, 301):
+            self.assertGreaterEqual(squares(size), best - 1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import math
+import unittest
+
+import numpy as np
+
+from src.geometry.Arc import Arc
+from src.geometry.Circle import Circle
+from src.geometry.Vector import Vector
+
+
+class TestCircleMethods(unittest.TestCase):
+    def test_flattening_stays_within_tolerance(self):
+        for radius in [5, 100, 2000]:
+            circle = Circle(Vector(10, 20), radius)
+            polygon = circle.polyline(tolerance=0.1)
+            # The middle of each side is the furthest point from the circle
+            midpoints = (polygon.coordinates[1:] + polygon.coordinates[:-1]) / 2
+            gaps = radius - np.hypot(*(midpoints - (10, 20)).T)
+            self.assertLessEqual(gaps.max(), 0.1)
+        self.assertLess(
+            Circle(Vector(0, 0), 5).polyline().number_of_points,
+            Circle(Vector(0, 0), 2000).polyline().number_of_points,
+        )
+
+    def test_fixed_resolution(self):
+        self.assertEqual(Circle(Vector(0, 0), 100).polyline(6).number_of_points, 7)
+
+    def test_arc_length_and_points_along(self):
+        arc = Arc(Vector(0, 0), 10, 0, -math.pi / 2)
+        self.assertEqual(arc.length, 5 * math.pi)
+        np.testing.assert_array_almost_equal(
+            arc.points_along([0, arc.length]), [[10, 0], [0, -10]]
+        )
+        flattened = arc.flatten()
+        np.testing.assert_array_almost_equal(flattened[[0, -1]], [[10, 0], [0, -10]])
+
+    def test_arcs_more_than_half_way_round_are_drawn_in_pieces(self):
+        for turns, pieces in [(0.5, 1), (0.75, 2), (1, 2), (1.5, 3), (2.25, 5)]:
+            arc = Arc(Vector(0, 0), 10, 0, -turns * 2 * math.pi)
+            commands = arc.svg_path_command(precision=6).split(" A")
+            self.assertEqual(len(commands), pieces)
+            # Each piece is at most half a circle, so never needs the large arc flag
+            for command in commands:
+                self.assertIn("0 0,1 ", command)
+            x, y = commands[-1].split(" ")[-1].split(",")
+            end = arc.end
+            self.assertAlmostEqual(float(x), end.x)
+            self.assertAlmostEqual(float(y), -end.y)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import math
+import unittest
+
+import numpy as np
+
+from src.competition import multiwinner_competition
+from src.geometry.Intersection import Intersection
+from src.geometry.Shape import Shape
+from src.geometry.Vector import Vector
+
+
+def corner_indices_one_by_one(shape: Shape, threshhold_angle):
+    "How corners were found before turning_angles, one Intersection at a time"
+    points = shape.points
+    return [
+        i
+        for i in range(1, len(points) - 1)
+        if abs(Intersection(points[i - 1], points[i], points[i + 1]).angle)
+        > threshhold_angle
+    ]
+
+
+def first_point_is_a_corner_one_by_one(shape: Shape, threshhold):
+    if not shape.is_closed:
+        return False
+    points = shape.points
+    return abs(Intersection(points[-2], points[0], points[1]).angle) > threshhold
+
+
+def sides_one_by_one(shape: Shape, threshhold=math.radians(15)):
+    "How sides were found before the side table"
+    corner_indices = corner_indices_one_by_one(shape, threshhold)
+    sides = [
+        shape.slice_by_index(i, j + 1)
+        for i, j in zip(corner_indices, corner_indices[1:])
+    ]
+    if shape.closed:
+        if first_point_is_a_corner_one_by_one(shape, threshhold):
+            sides.insert(0, shape.slice_by_index(0, corner_indices[0] + 1))
+            sides.append(
+                shape.slice_by_index(corner_indices[-1], shape.number_of_points)
+            )
+        else:
+            sides.append(shape.slice_by_index(corner_indices[-1], corner_indices[1]))
+    return sides
+
+
+def crenellated():
+    "A closed shape with two top sides at the same height, and two bottom ones"
+    return Shape(
+        [
+            Vector(0, 0),
+            Vector(40, 0),
+            Vector(40, -20),
+            Vector(60, -20),
+            Vector(60, 0),
+            Vector(100, 0),
+            Vector(100, 50),
+            Vector(60, 50),
+            Vector(60, 30),
+            Vector(40, 30),
+            Vector(40, 50),
+            Vector(0, 50),
+        ]
+    ).close()
+
+
+def square(size=100):
+    return Shape(
+        [Vector(0, 0), Vector(size, 0), Vector(size, size), Vector(0, size)]
+    ).close()
+
+
+def wiggly():
+    "A closed shape whose first point is halfway along a gently curving side"
+    shape = Shape().start_at(Vector(0, 0))
+    for angle in np.linspace(0, math.pi / 2, 10)[1:]:
+        shape.line_to(Vector(200 * math.sin(angle), 40 * (1 - math.cos(angle))))
+    shape.line_to(Vector(200, 150))
+    shape.line_to(Vector(-120, 150))
+    shape.line_to(Vector(-150, 40))
+    shape.line_to(Vector(-100, 0))
+    return shape.close()
+
+
+class TestCorners(unittest.TestCase):
+    def assertCornersMatch(self, shape, threshhold):
+        self.assertEqual(
+            shape.corner_indices(threshhold),
+            corner_indices_one_by_one(shape, threshhold),
+        )
+        self.assertEqual(
+            shape.first_point_is_a_corner(threshhold),
+            first_point_is_a_corner_one_by_one(shape, threshhold),
+        )
+        indices = [0, *corner_indices_one_by_one(shape, threshhold)]
+        self.assertEqual(shape.corners(threshhold), [shape.points[i] for i in indices])
+
+    def test_square(self):
+        shape = square()
+        self.assertEqual(shape.corner_indices(), [1, 2, 3])
+        self.assertIsInstance(shape.corner_indices(), list)
+        self.assertTrue(shape.first_point_is_a_corner())
+        np.testing.assert_array_almost_equal(shape.turning_angles(), [math.pi / 2] * 5)
+        self.assertCornersMatch(shape, math.radians(15))
+
+    def test_first_point_of_a_closed_shape(self):
+        self.assertTrue(square().first_point_is_a_corner())
+        shape = wiggly()
+        self.assertFalse(shape.first_point_is_a_corner())
+        self.assertTrue(
+            Shape(shape.points[10:] + shape.points[1:11]).first_point_is_a_corner()
+        )
+        for threshhold in [5, 15, 45, 80]:
+            self.assertCornersMatch(shape, math.radians(threshhold))
+        # An open shape never starts at a corner
+        self.assertFalse(Shape(square().points[:-1]).first_point_is_a_corner())
+
+    def test_threshhold_at_a_turn_is_not_a_corner(self):
+        shape = square()
+        self.assertEqual(shape.corner_indices(math.pi / 2), [])
+        self.assertFalse(shape.first_point_is_a_corner(math.pi / 2))
+        self.assertEqual(
+            shape.corner_indices(math.nextafter(math.pi / 2, 0)), [1, 2, 3]
+        )
+        for threshhold in [math.pi / 2, math.nextafter(math.pi / 2, 0)]:
+            self.assertCornersMatch(shape, threshhold)
+
+    def test_changing_the_points_forgets_the_turns(self):
+        shape = Shape([Vector(0, 0), Vector(100, 0), Vector(200, 0)])
+        self.assertEqual(shape.corner_indices(), [])
+        shape.line_to(Vector(200, 100))
+        self.assertIsNone(shape._turning_angles)
+        self.assertEqual(shape.corner_indices(), [2])
+        shape.translate_in_place(Vector(5, 5))
+        shape.append(Vector(300, 300))
+        self.assertEqual(shape.corner_indices(), [2, 3])
+        self.assertCornersMatch(shape, math.radians(15))
+
+
+class TestSides(unittest.TestCase):
+    def assertSameShapes(self, shapes, expected):
+        self.assertEqual(
+            [shape.points for shape in shapes], [shape.points for shape in expected]
+        )
+
+    def test_sides_match_finding_them_one_by_one(self):
+        for shape in [square(), wiggly(), crenellated(), Shape(wiggly().points[:-3])]:
+            for threshhold in [math.radians(15), math.radians(45)]:
+                self.assertSameShapes(
+                    shape.sides(threshhold), sides_one_by_one(shape, threshhold)
+                )
+            self.assertEqual(
+                [side.label for side in shape.numbered_sides()],
+                ["side {}".format(i) for i in range(len(sides_one_by_one(shape)))],
+            )
+            self.assertSameShapes(shape.numbered_sides(), sides_one_by_one(shape))
+
+    def test_changing_a_side_does_not_change_the_shape(self):
+        shape = crenellated()
+        shape.sides()[0].translate_in_place(Vector(1000, 0))
+        self.assertSameShapes(shape.sides(), sides_one_by_one(shape))
+
+    def test_topmost_sides_with_ties(self):
+        shape = crenellated()
+        sides = sides_one_by_one(shape)
+
+        def height(side):
+            return side.center_of_mass().y
+
+        for number in range(1, len(sides) + 1):
+            self.assertSameShapes(
+                shape.topmost_sides(number), sorted(sides, key=height)[:number]
+            )
+        # The first of the two top sides at the same height wins
+        top = [side for side in sides if height(side) == 50]
+        self.assertEqual(len(top), 2)
+        self.assertEqual(shape.topmost_side().points, top[0].points)
+        left = min(sides, key=lambda side: side.center_of_mass().x)
+        self.assertEqual(shape.leftmost_side().points, left.points)
+
+    def test_multiwinner_competition_keeps_ties_in_order(self):
+        items = ["b1", "a1", "c", "a2", "b2", "a3"]
+        for number in range(len(items) + 1):
+            self.assertEqual(
+                multiwinner_competition(items, lambda item: item[0], number),
+                sorted(items, key=lambda item: item[0])[:number],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
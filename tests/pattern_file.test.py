@@ -0,0 +1,79 @@
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.geometry.Group import Group
+from src.geometry.Shape import Shape
+from src.geometry.Vector import Vector
+from src.notches import Notch
+from src.pattern_file import LazyObjects, PatternFile, load_pattern, save_pattern
+
+
+class TestPatternFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "pattern.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        side = Shape([Vector(0, 0), Vector(100, 0), Vector(100, 50)], label="side")
+        curved = Shape([Vector(0, 0)], style="dashed")
+        curved.curve_to(Vector(50, 0), Vector(10, 20), Vector(40, 20))
+        curved.arc_to(Vector(50, 10), math.pi)
+        notch = Notch(Vector(1, 2), 0.5, 6, 3)
+        inner = Group(point=Vector(3, 4, label="p"), curved=curved, notch=notch)
+        inner.label = "ε inner"
+        pattern = Group(side, inner=inner)
+        save_pattern(self.filename, pattern)
+
+        loaded = load_pattern(self.filename)
+        self.assertIsInstance(loaded.objects, LazyObjects)
+        self.assertEqual(list(loaded.objects), list(pattern.objects))
+        self.assertEqual(loaded["unlabeled_0"].content_hash(), side.content_hash())
+        self.assertEqual(loaded["inner"].label, "ε inner")
+        self.assertEqual(loaded["inner"]["point"].label, "p")
+        self.assertTrue(loaded["inner"]["curved"].has_curves)
+        self.assertEqual(
+            loaded["inner"]["notch"].shape().content_hash(),
+            notch.shape().content_hash(),
+        )
+        self.assertEqual(
+            loaded["inner"]["curved"].svg_path_data(), curved.svg_path_data()
+        )
+        np.testing.assert_array_equal(
+            loaded["inner"]["curved"].coordinates, curved.coordinates
+        )
+
+        # Loaded shapes are copies which can be changed
+        loaded["unlabeled_0"].line_to(Vector(0, 50))
+        self.assertEqual(len(side.points), 3)
+
+    def test_pieces_are_loaded_when_used(self):
+        pieces = Group(*[Shape([Vector(i, 0), Vector(i, 10)]) for i in range(1000)])
+        save_pattern(self.filename, pieces)
+
+        pattern = PatternFile(self.filename)
+        self.assertEqual(len(pattern), 1000)
+        self.assertIsInstance(pattern.coordinates, np.memmap)
+        group = pattern.group()
+        self.assertEqual(group["unlabeled_500"].points[0].x, 500)
+        objects = group.objects.objects
+        loaded = [key for key in objects if isinstance(objects[key], Shape)]
+        self.assertEqual(loaded, ["unlabeled_500"])
+
+    def test_errors(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"not a pattern")
+        with self.assertRaises(ValueError):
+            PatternFile(self.filename)
+        with self.assertRaises(ValueError):
+            save_pattern(self.filename, Group(object()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import math
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from src.geometry.Shape import Shape
+from src.geometry.Vector import Vector
+
+
+class TestShapeMethods(unittest.TestCase):
+    def test_points_are_stored_as_an_array(self):
+        shape = Shape([Vector(0, 0), Vector(0, 0), Vector(10, 0), Vector(10, 5)])
+        self.assertEqual(shape.coordinates.shape, (3, 2))
+        self.assertEqual(shape.points[1], Vector(10, 0))
+
+    def test_appending_points(self):
+        shape = Shape().start_at(Vector(0, 0))
+        for i in range(1, 20):
+            shape.line_to(Vector(i, 0))
+        shape.line_to(Vector(19, 0))
+        self.assertEqual(shape.number_of_points, 20)
+        self.assertEqual(shape.length, 19)
+
+    def test_bounds(self):
+        shape = Shape([Vector(-5, 2), Vector(10, -3), Vector(4, 8)])
+        self.assertEqual(shape.left, -5)
+        self.assertEqual(shape.right, 10)
+        self.assertEqual(shape.top, 8)
+        self.assertEqual(shape.bottom, -3)
+
+    def test_translate_does_not_change_the_original(self):
+        shape = Shape([Vector(0, 0), Vector(10, 0)])
+        moved = shape.translate(Vector(5, 5))
+        self.assertEqual(moved.first_point, Vector(5, 5))
+        self.assertEqual(shape.first_point, Vector(0, 0))
+        np.testing.assert_array_equal(shape.coordinates, [[0, 0], [10, 0]])
+
+    def test_measuring_along_uses_fresh_lengths_after_appending(self):
+        shape = Shape([Vector(0, 0), Vector(10, 0)])
+        self.assertEqual(shape.point_along(5), Vector(5, 0))
+        shape.line_to(Vector(10, 10))
+        self.assertEqual(shape.length, 20)
+        self.assertEqual(shape.point_along(15), Vector(10, 5))
+        measurement = shape.measureAlong(15)
+        self.assertEqual(measurement.index, 1)
+        self.assertEqual(measurement.remainder, 5)
+        with self.assertRaises(ValueError):
+            shape.measureAlong(21)
+
+    def test_points_along_in_one_call(self):
+        shape = Shape([Vector(0, 0), Vector(10, 0), Vector(10, 10)])
+        along = shape.points_along([0, 5, 15])
+        np.testing.assert_array_equal(along.indices, [0, 0, 1])
+        np.testing.assert_array_equal(along.points, [[0, 0], [5, 0], [10, 5]])
+        np.testing.assert_array_equal(along.tangents[2], [0, 1])
+        np.testing.assert_array_equal(along.normals[0], [0, 1])
+
+    def test_closest_many(self):
+        shape = Shape([Vector(0, 0), Vector(10, 0), Vector(10, 10)])
+        distances, indices, remainders = shape.closest_many(
+            [Vector(5, 3), Vector(12, 6), Vector(20, -5)]
+        )
+        np.testing.assert_array_almost_equal(distances, [3, 2, np.hypot(10, 5)])
+        np.testing.assert_array_equal(indices, [0, 1, 0])
+        np.testing.assert_array_almost_equal(remainders, [5, 6, 10])
+        self.assertEqual(shape.at(Vector(12, 6)).lengthAlong, 16)
+
+    def test_points_are_inside(self):
+        # A square with a notch cut out of the top
+        shape = Shape(
+            [
+                Vector(0, 0),
+                Vector(0, 10),
+                Vector(4, 10),
+                Vector(5, 5),
+                Vector(6, 10),
+                Vector(10, 10),
+                Vector(10, 0),
+            ]
+        ).close()
+        inside = shape.points_are_inside(
+            [Vector(1, 1), Vector(5, 8), Vector(11, 5), Vector(0, 5), Vector(5, 5)]
+        )
+        np.testing.assert_array_equal(inside, [True, False, False, True, True])
+        self.assertFalse(shape.point_is_inside(Vector(-1, 5)))
+
+    def test_bounds_follow_changes_to_the_points(self):
+        shape = Shape([Vector(0, 0), Vector(10, 0)])
+        self.assertEqual(shape.width, 10)
+        shape.line_to(Vector(20, 5))
+        self.assertEqual(shape.right, 20)
+        shape.translate_in_place(Vector(1, 1))
+        self.assertEqual(shape.top, 6)
+        self.assertEqual(shape.left, 1)
+
+    def test_centroids_and_area(self):
+        shape = Shape([Vector(0, 0), Vector(0, 10), Vector(30, 10), Vector(30, 0)])
+        self.assertEqual(shape.center_of_mass(), Vector(15, 8))
+        self.assertEqual(shape.area(), 300)
+        self.assertEqual(shape.area_centroid(), Vector(15, 5))
+        self.assertEqual(shape.close().area_centroid(), Vector(15, 5))
+
+    def test_parallel_miters_corners_and_keeps_straight_runs(self):
+        shape = Shape([Vector(0, 0), Vector(10, 0), Vector(20, 0), Vector(20, 10)])
+        np.testing.assert_array_almost_equal(
+            shape.parallel(2).coordinates, [[0, 2], [10, 2], [18, 2], [18, 10]]
+        )
+
+    def test_parallel_clamps_long_miters(self):
+        spike = Shape([Vector(0, 0), Vector(100, 1), Vector(0, 2)])
+        tip = spike.parallel(1, miter_limit=4).coordinates[1]
+        self.assertAlmostEqual(np.hypot(*(tip - [100, 1])), 4)
+
+    def test_parallel_removes_loops(self):
+        # The last bit before the corner is shorter than the offset, so it turns back
+        shape = Shape([Vector(50, 50), Vector(50, 10), Vector(50, 0), Vector(0, 0)])
+        np.testing.assert_array_almost_equal(
+            shape.parallel(-25).coordinates, [[25, 50], [25, 25], [0, 25]]
+        )
+
+    def test_parallels_match_single_offsets(self):
+        shape = Shape([Vector(0, 0), Vector(10, 3), Vector(12, 20), Vector(-5, 25)])
+        for distance, offset in zip([-3, 2, 7], shape.parallels([-3, 2, 7])):
+            np.testing.assert_array_equal(
+                offset.coordinates, shape.parallel(distance).coordinates
+            )
+
+    def test_interpolating_to_a_tolerance(self):
+        small = Shape([Vector(0, 0), Vector(0, 2), Vector(2, 3), Vector(3, 1)])
+        large = small.scale(100)
+        for shape in [small, large]:
+            curve = shape.interpolate(tolerance=0.1)
+            self.assertEqual(curve.last_point, shape.last_point)
+            # Every point of a finely sampled curve is close to the flattened one
+            fine = shape.interpolate(upres=200)
+            distances, _, _ = curve.closest_many(fine.coordinates)
+            self.assertLess(distances.max(), 0.1)
+        self.assertLess(
+            small.interpolate(tolerance=0.1).number_of_points,
+            large.interpolate(tolerance=0.1).number_of_points,
+        )
+
+    def test_curves_are_flattened_when_needed(self):
+        shape = Shape().start_at(Vector(0, 0))
+        shape.curveTo(Vector(100, 0), curve=10)
+        shape.line_to(Vector(100, -50))
+        self.assertTrue(shape.has_curves)
+        self.assertEqual(shape.last_point, Vector(100, -50))
+        self.assertGreater(shape.number_of_points, 3)
+        self.assertAlmostEqual(shape.top, 10, places=1)
+        self.assertIn(" C", shape.svg_path_data())
+        self.assertTrue(shape.svg_path_data().endswith("L100.0,50.0"))
+
+    def test_arcs(self):
+        shape = Shape([Vector(0, 0), Vector(0, 100)]).continue_with_arc(50, math.pi)
+        self.assertEqual(shape.last_point, Vector(-100, 100))
+        radii = np.hypot(*(shape.coordinates[1:] - (-50, 100)).T)
+        np.testing.assert_array_almost_equal(radii, 50)
+        self.assertLess(shape.length - 100, 50 * math.pi)
+        self.assertAlmostEqual(shape.length - 100, 50 * math.pi, delta=0.2)
+        self.assertIn(" A50.0,50.0 0 0,0 -100.0,-100.0", shape.svg_path_data())
+
+    def test_curves_are_kept_when_moving_or_extending(self):
+        shape = Shape([Vector(0, 0), Vector(0, 100)]).continue_with_arc(50, math.pi)
+        shape.curveTo(Vector(-100, 0), curve=10)
+        flattened = shape.coordinates.copy()
+
+        moved = shape.translate(Vector(10, 20))
+        shape.translate_in_place(Vector(10, 20))
+        for moved in [moved, shape]:
+            self.assertEqual(len(moved._curves), 2)
+            np.testing.assert_array_almost_equal(
+                moved.coordinates, flattened + (10, 20)
+            )
+            self.assertIn(" A50.0,50.0 0 0,0 -90.0,-120.0", moved.svg_path_data())
+
+        shape.line_through_coordinates(np.array([(-90, 20), (-90, -50)]))
+        self.assertEqual(len(shape._curves), 2)
+        self.assertEqual(shape.last_point, Vector(-90, -50))
+
+        # A whole circle starts and ends at the same point, but isn't a repeated point
+        circle = Shape([Vector(0, 0), Vector(10, 0)]).arc_to(Vector(20, 0), 2 * math.pi)
+        circle.fix_points()
+        self.assertEqual(len(circle._curves), 1)
+        self.assertAlmostEqual(circle.length, 10 + 20 * math.pi, delta=0.2)
+
+    def test_import_does_not_load_rendering(self):
+        # A fresh interpreter, importing src from this checkout wherever the tests run
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        modules = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, src.geometry.Shape, src.sizing.BodyMeasurements; "
+                "print(*sys.modules)",
+            ],
+            cwd=root,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        for module in ["drawSvg", "scipy", "collision", "xml.sax.saxutils"]:
+            self.assertNotIn(module, modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import io
+import re
+import tempfile
+import unittest
+
+from src.geometry.Group import Group
+from src.geometry.Rectangle import Rectangle
+from src.geometry.Shape import Shape
+from src.geometry.Vector import Vector
+from src.render import render, render_to
+from src.svg_cache import SvgCache, drawsvg_supports_fragments, svg_cache, use_svg_cache
+from src.svg_writer import SvgWriter
+
+
+def triangle(size=100, label=None):
+    return Shape([Vector(0, 0), Vector(size, 0), Vector(size, size / 2)], label=label)
+
+
+class TestSvgCache(unittest.TestCase):
+    def test_content_hash(self):
+        shape = triangle(label="side")
+        self.assertEqual(shape.content_hash(), shape.copy().content_hash())
+        self.assertNotEqual(shape.content_hash(), triangle(101, "side").content_hash())
+        self.assertNotEqual(
+            shape.content_hash(), shape.with_label("top").content_hash()
+        )
+        self.assertNotEqual(
+            shape.content_hash(), shape.with_style("dashed").content_hash()
+        )
+
+        moved = shape.copy()
+        before = moved.content_hash()
+        moved.line_to(Vector(0, 50))
+        self.assertNotEqual(before, moved.content_hash())
+
+        curved = triangle()
+        curved.curve_to(Vector(0, 50), Vector(50, 60), Vector(20, 60))
+        other = triangle()
+        other.curve_to(Vector(0, 50), Vector(50, 70), Vector(20, 60))
+        self.assertNotEqual(curved.content_hash(), other.content_hash())
+
+        group = Group(shape, triangle(50))
+        self.assertEqual(
+            group.content_hash(), Group(shape, triangle(50)).content_hash()
+        )
+        self.assertNotEqual(
+            group.content_hash(), Group(shape, triangle(60)).content_hash()
+        )
+        self.assertIsNone(Group(shape, Vector(1, 1)).content_hash())
+
+    def test_only_changed_pieces_are_written_again(self):
+        pieces = [
+            triangle(size, label="piece {}".format(size)) for size in range(10, 60, 10)
+        ]
+        svg_cache.clear()
+        # Nothing is cached until it's asked for
+        render(Group(*pieces)).asSvg()
+        self.assertEqual(svg_cache.misses, 0)
+        self.assertEqual(len(svg_cache), 0)
+
+        use_svg_cache()
+        self.addCleanup(use_svg_cache, False)
+        first = render(Group(*pieces)).asSvg()
+        self.assertEqual(svg_cache.misses, 6)
+
+        # The group has changed, but only the new piece needs writing
+        pieces[2] = triangle(33, label="changed")
+        render(Group(*pieces))
+        self.assertEqual(svg_cache.misses, 8)
+        render(Group(*pieces))
+        self.assertEqual(svg_cache.misses, 8)
+        self.assertEqual(
+            first.count("<path"), render(Group(*pieces)).asSvg().count("<path")
+        )
+
+    def test_streamed_output_is_the_same_from_the_cache(self):
+        shape = triangle(label="side")
+        group = Group(shape, Vector(10, 10).with_label("p"))
+        rect = Rectangle(0, 100, 100, 0)
+        outputs = []
+        for cache in [None, SvgCache(), True, True]:
+            output = io.StringIO()
+            writer = SvgWriter(output, rect, cache=cache)
+            writer.object(group)
+            writer.object(shape)
+            writer.close()
+            outputs.append(output.getvalue())
+        # Cached fragments use their own ids, but are otherwise the same
+        self.assertEqual(outputs[0].count("<"), outputs[1].count("<"))
+        self.assertEqual(outputs[1], outputs[2])
+        self.assertEqual(outputs[2], outputs[3])
+
+        compact = io.StringIO()
+        render_to(compact, shape, compact=True)
+        self.assertIn("l100,0", compact.getvalue())
+
+    def test_the_same_object_twice_has_different_ids(self):
+        shape = triangle(label="side")
+        use_svg_cache()
+        self.addCleanup(use_svg_cache, False)
+        drawn = render(Group(shape, shape), shape).asSvg()
+
+        output = io.StringIO()
+        writer = SvgWriter(output, Rectangle(0, 100, 100, 0), cache=SvgCache())
+        writer.object(Group(shape, shape))
+        writer.object(shape)
+        writer.close()
+
+        for svg in [drawn, output.getvalue()]:
+            ids = re.findall(r' id="([^"]+)"', svg)
+            self.assertEqual(len(ids), 3)
+            self.assertEqual(len(set(ids)), 3)
+            # Each label refers to its own copy of the path
+            self.assertEqual(sorted(re.findall(r'href="#([^"]+)"', svg)), sorted(ids))
+
+    def test_drawsvg_supports_fragments(self):
+        # SvgFragment stands in for drawSvg elements, so this fails if drawSvg changes
+        # how they're written
+        self.assertTrue(drawsvg_supports_fragments())
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            SvgCache(directory=directory).put("0123abcd", "<path />\n")
+            cache = SvgCache(maxsize=1, directory=directory)
+            self.assertEqual(cache.get("0123abcd"), "<path />\n")
+            self.assertIsNone(cache.get("4567"))
+            cache.put("4567", "<circle />\n")
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(SvgCache(directory=directory).get("4567"), "<circle />\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
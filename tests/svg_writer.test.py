@@ -0,0 +1,50 @@
+import io
+import unittest
+import xml.dom.minidom
+
+from src.geometry.Group import Group
+from src.geometry.Shape import Shape
+from src.geometry.Vector import Vector
+from src.render import render, render_to
+
+
+class TestSvgWriter(unittest.TestCase):
+    def test_streams_the_same_elements_as_render(self):
+        shape = Shape([Vector(0, 0), Vector(100, 0), Vector(100, 50)], label="side")
+        group = Group(shape.with_style("polygon"), Vector(10, 10).with_label("p"))
+        group.label = "two\nlines"
+
+        output = io.StringIO()
+        render_to(output, shape, group)
+        streamed = xml.dom.minidom.parseString(output.getvalue())
+        built = xml.dom.minidom.parseString(render(shape, group).asSvg())
+
+        for tag in ["path", "text", "circle", "tspan"]:
+            self.assertEqual(
+                len(streamed.getElementsByTagName(tag)),
+                len(built.getElementsByTagName(tag)),
+                tag,
+            )
+        self.assertIn('d="M0.0,-0.0 L100.0,-0.0 L100.0,-50.0"', output.getvalue())
+
+    def test_compact_output(self):
+        shape = Shape([Vector(0.123456, 0), Vector(100.1, 0.3), Vector(100, 50)])
+        self.assertEqual(
+            shape.svg_path_data(precision=2, relative=True),
+            "M0.12,0 l99.98,-0.3 -0.1,-49.7",
+        )
+
+        full, compact, pattern = io.StringIO(), io.StringIO(), io.StringIO()
+        render_to(full, shape)
+        render_to(compact, shape, compact=True)
+        render_to(pattern, shape, compact=True, grid_pattern=True)
+        self.assertLess(len(compact.getvalue()), len(full.getvalue()))
+        for output in [compact, pattern]:
+            document = xml.dom.minidom.parseString(output.getvalue())
+            # The shape, plus one path for each grid (or the pattern's tile)
+            self.assertEqual(len(document.getElementsByTagName("path")), 3)
+        self.assertEqual(len(document.getElementsByTagName("pattern")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import re
+import tempfile
+import unittest
+import xml.dom.minidom
+
+from src.geometry.Group import Group
+from src.geometry.Shape import Shape
+from src.geometry.Vector import Vector
+from src.notches import Notch
+from src.tiled_print import (
+    page_pdf_content,
+    print_pages,
+    print_pdf,
+    print_svgs,
+    write_svg_page,
+)
+
+
+class TestTiledPrint(unittest.TestCase):
+    def setUp(self):
+        # Two small shapes far enough apart to need separate pages
+        self.drawing = Group(
+            Shape([Vector(0, 0), Vector(50, 0), Vector(50, 20)], label="a"),
+            Shape([Vector(500, 300), Vector(550, 300)]),
+        )
+
+    def test_pages_only_hold_what_is_on_them(self):
+        pages = print_pages(self.drawing, overlap=10)
+        self.assertEqual(len(pages), 4)
+        self.assertEqual([page.name for page in pages], ["α0", "α1", "β0", "β1"])
+        for page in pages:
+            for item in page.items:
+                left, bottom, right, top = item.bounds()
+                self.assertLessEqual(left, page.rect.right)
+                self.assertGreaterEqual(right, page.rect.left)
+        # The labelled shape and its label, and the other shape
+        self.assertEqual(len(pages[0].items), 2)
+        self.assertEqual(len(pages[3].items), 1)
+        # Neighbouring pages share registration marks
+        self.assertIn(pages[0].registration_marks()[2], pages[2].registration_marks())
+
+    def test_pdf_and_svgs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "drawing.pdf")
+            print_pdf(filename, self.drawing, processes=1)
+            with open(filename, "rb") as f:
+                pdf = f.read()
+            self.assertEqual(pdf.count(b"/Type /Page "), 4)
+            # Every cross reference points at the object it says it does
+            offsets = re.findall(rb"(\d{10}) 00000 n", pdf)
+            for number, offset in enumerate(offsets, start=1):
+                self.assertTrue(pdf[int(offset) :].startswith(b"%d 0 obj" % number))
+
+            files = print_svgs(
+                os.path.join(directory, "pages", "drawing"), self.drawing, processes=1
+            )
+            self.assertEqual(len(files), 4)
+            for file in files:
+                document = xml.dom.minidom.parse(file)
+                width = document.documentElement.getAttribute("width")
+                self.assertTrue(width.endswith("mm"))
+                self.assertEqual(float(width[:-2]), 297)
+
+    def test_styles_are_drawn_like_render(self):
+        notch = Notch(Vector(0, 0), 90, 10, 4)
+        ruler = Shape([Vector(20, 0), Vector(60, 0)], style="ruler")
+        (page,) = print_pages(notch, ruler)
+
+        pdf = page_pdf_content(page).decode("cp1252")
+        # The notch is filled, not outlined
+        self.assertEqual(pdf.count(" f\n"), 1)
+        # A tick and a label every 10mm along the ruler
+        self.assertEqual(
+            [line for line in pdf.splitlines() if line.endswith("mm) Tj")],
+            ["(0mm) Tj", "(10mm) Tj", "(20mm) Tj", "(30mm) Tj"],
+        )
+        self.assertEqual(pdf.count(" RG "), 1 + 4)
+
+        with tempfile.TemporaryDirectory() as directory:
+            document = xml.dom.minidom.parse(
+                write_svg_page(page, os.path.join(directory, "page.svg"))
+            )
+        paths = document.getElementsByTagName("path")
+        self.assertEqual(
+            [path.getAttribute("fill") for path in paths].count("#000000"), 1
+        )
+        labels = [
+            span.firstChild.data for span in document.getElementsByTagName("tspan")
+        ]
+        self.assertEqual(labels, ["0mm", "10mm", "20mm", "30mm"])
+
+        with self.assertRaises(ValueError):
+            print_pages(Shape([Vector(0, 0), Vector(10, 0)], style="wavy"))
+
+    def test_pdf_labels_are_limited_to_the_standard_fonts(self):
+        shape = Shape([Vector(0, 0), Vector(50, 0)], label="Größe – 東京")
+        (page,) = print_pages(shape)
+        pdf = page_pdf_content(page)
+        self.assertIn("(Größe – ??) Tj".encode("cp1252"), pdf)
+
+
+if __name__ == "__main__":
+    unittest.main()
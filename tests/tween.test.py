@@ -0,0 +1,118 @@
+import math
+import unittest
+
+import numpy as np
+
+from src.geometry.angles import (
+    normalize_angles,
+    normalizeAngle,
+    shortest_turn,
+    shortest_turns,
+)
+from src.geometry.Shape import Shape
+from src.geometry.tween import (
+    pointwise_tween,
+    pointwise_tween_coordinates,
+    tween,
+    tween_coordinates,
+    tweens,
+)
+from src.geometry.Vector import Vector, polar
+
+
+def tween_one_by_one(a: Shape, b: Shape, phase: float, resolution=1.0) -> Shape:
+    "How tween worked before, one point and one phase at a time"
+    step = resolution / max(a.length, b.length)
+    shape = Shape()
+    shape.start_at(a.first_point * (1.0 - phase) + b.first_point * phase)
+    last_p = last_q = None
+    for w in np.arange(step, 1.0, step):
+        p = a.pointAlong(w * a.length)
+        q = b.pointAlong(w * b.length)
+        if last_p:
+            vP = p - last_p
+            vQ = q - last_q
+            turn = vP.angle + shortest_turn(vQ.angle, vP.angle) * phase
+            length = vP.length * (1.0 - phase) + phase * vQ.length
+            shape.append(shape.last_point + polar(turn, length))
+        last_p, last_q = p, q
+    return shape
+
+
+def pointwise_tween_one_by_one(
+    a: Shape, b: Shape, phase: float, resolution=1.0
+) -> Shape:
+    shape = Shape()
+    for w in np.arange(0, 1, resolution / max(a.length, b.length)):
+        p = a.pointAlong(w * a.length)
+        q = b.pointAlong(w * b.length)
+        shape.line_to(p + (q - p) * phase)
+    return shape
+
+
+def heading_left(wiggle: float) -> Shape:
+    "A shape going left, so its steps point either side of the -pi / pi wrap around"
+    xs = np.linspace(0, -60, 13)
+    ys = wiggle * (-1) ** np.arange(13)
+    return Shape(np.stack([xs, ys], axis=1))
+
+
+# Multiples of pi, and either side of them
+wrap_around_angles = np.concatenate(
+    [
+        np.add.outer(np.arange(-7, 8) * math.pi, [-1e-9, 0, 1e-9]).ravel(),
+        np.linspace(-20, 20, 401),
+    ]
+)
+
+
+class TestAngles(unittest.TestCase):
+    def test_normalize_angles(self):
+        expected = [normalizeAngle(angle) for angle in wrap_around_angles.tolist()]
+        np.testing.assert_allclose(
+            normalize_angles(wrap_around_angles), expected, atol=1e-12
+        )
+        self.assertEqual(
+            normalize_angles([math.pi, 3 * math.pi]).tolist(), [math.pi] * 2
+        )
+        self.assertEqual(normalize_angles(-math.pi), -math.pi)
+
+    def test_shortest_turns(self):
+        a, b = np.meshgrid(wrap_around_angles[::3], wrap_around_angles[::7])
+        a, b = a.ravel(), b.ravel()
+        expected = [shortest_turn(x, y) for x, y in zip(a.tolist(), b.tolist())]
+        turns = shortest_turns(a, b)
+        # Rounding can leave the while loops at a whole turn where np.mod gives no turn
+        np.testing.assert_allclose(normalize_angles(turns - expected), 0, atol=1e-12)
+
+
+class TestTween(unittest.TestCase):
+    def setUp(self):
+        self.a = heading_left(2)
+        self.b = heading_left(-3).translate(Vector(0, 40))
+        self.phases = [0, 0.25, 0.5, 0.75, 1]
+
+    def test_tweens_match_tweening_one_phase_at_a_time(self):
+        many = tween_coordinates(self.a, self.b, self.phases)
+        for phase, coordinates, shape in zip(
+            self.phases, many, tweens(self.a, self.b, self.phases)
+        ):
+            expected = tween_one_by_one(self.a, self.b, phase).coordinates
+            np.testing.assert_allclose(coordinates, expected, atol=1e-9)
+            np.testing.assert_allclose(shape.coordinates, expected, atol=1e-9)
+            np.testing.assert_allclose(
+                tween(self.a, self.b, phase).coordinates, expected, atol=1e-9
+            )
+
+    def test_pointwise_tweens_match_one_phase_at_a_time(self):
+        many = pointwise_tween_coordinates(self.a, self.b, self.phases)
+        for phase, coordinates in zip(self.phases, many):
+            expected = pointwise_tween_one_by_one(self.a, self.b, phase).coordinates
+            np.testing.assert_allclose(coordinates, expected, atol=1e-9)
+            np.testing.assert_allclose(
+                pointwise_tween(self.a, self.b, phase).coordinates, expected, atol=1e-9
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import math
 import unittest
 
 from src.geometry.Vector import Vector
@@ -17,6 +18,28 @@ class TestVec2Methods(unittest.TestCase):
         self.assertEqual(normal.length, v.length)
         self.assertEqual(normal.x, -1)
 
+    def test_squaring(self):
+        v = Vector(1, 2, label="a")
+        self.assertEqual(v.squareRight(5), Vector(6, 2))
+        self.assertEqual(v.squareLeft(1.5), Vector(-0.5, 2))
+        self.assertEqual(v.squareUp(Vector(7, 9)), Vector(1, 9))
+        self.assertEqual(v.squareDown(Vector(7, 9)), Vector(1, 9))
+        self.assertEqual(v.squareRight(Vector(7, 9)), Vector(7, 2))
+        self.assertEqual(v.move(1, 1).label, "a")
+
+    def test_rotating(self):
+        v = Vector(3, 4).rotate(math.pi / 2)
+        self.assertAlmostEqual(v.x, -4)
+        self.assertAlmostEqual(v.y, 3)
+        self.assertAlmostEqual(Vector(3, 4).extend(5).length, 10)
+        self.assertAlmostEqual(Vector(3, 4).with_angle(0).x, 5)
+
+    def test_slots(self):
+        v = Vector(1, 2)
+        v.label = "labelled"
+        self.assertEqual(v.label, "labelled")
+        self.assertFalse(hasattr(v, "__dict__"))
+
 
 if __name__ == "__main__":
     unittest.main()
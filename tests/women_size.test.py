@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+
+from src.sizing.BodyMeasurements import BodyMeasurements
+from src.sizing.women_size import (
+    measurement_index,
+    measurement_to_size,
+    measurements_at_sizes,
+    size_to_measurement,
+    women_size_table,
+)
+
+
+class TestWomenSize(unittest.TestCase):
+    def test_interpolation(self):
+        self.assertEqual(size_to_measurement["waist"](12), 720)
+        self.assertAlmostEqual(size_to_measurement["waist"](13), 740)
+        # Carries on past both ends of the table
+        self.assertAlmostEqual(size_to_measurement["waist"](4), 560)
+        self.assertAlmostEqual(size_to_measurement["waist"](28), 1120)
+        self.assertAlmostEqual(measurement_to_size["hips"](1000), 14)
+        self.assertAlmostEqual(measurement_to_size["hips"](1320), 28)
+        np.testing.assert_allclose(
+            measurement_to_size["waist"]([600, 620, 1060]), [6, 7, 26]
+        )
+
+    def test_every_measurement_at_many_sizes(self):
+        table = measurements_at_sizes([6, 11, 30])
+        self.assertEqual(table.shape, (len(women_size_table), 3))
+        for key, i in measurement_index.items():
+            self.assertEqual(table[i, 0], women_size_table[key][0])
+            np.testing.assert_array_equal(
+                table[i], size_to_measurement[key]([6, 11, 30])
+            )
+
+    def test_body_measurements(self):
+        body = BodyMeasurements(hips=1000, waist=760)
+        self.assertAlmostEqual(body.size, 14)
+        self.assertEqual(body.waist, 760)
+        self.assertAlmostEqual(body.all["bust"], 920)
+        self.assertIn("bust", body.approximations)
+        deviances = body.deviances()
+        self.assertAlmostEqual(deviances["waist"], 0)
+        self.assertEqual(deviances["bust"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()